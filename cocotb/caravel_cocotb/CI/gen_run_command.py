@@ -22,6 +22,7 @@ Command = namedtuple(
         "sim_path",
         "verbosity",
         "compile",
+        "jobs",
         "check_commits",
         "run_location",
         "CI",
@@ -140,7 +141,10 @@ class GenerateCommands(BaseClass):
         )
         # self.verbosities_chooser = RandomChooser([None, "quiet", "normal", "debug"])
         self.verbosities_chooser = RandomChooser(["debug"])  # to speed sims
-        self.compiles_chooser = RandomChooser([None, True])
+        # (compile, jobs) pairs so -compile is also run with parallel tests
+        self.compiles_chooser = RandomChooser(
+            [(None, None), (None, 2), (True, None), (True, 2)]
+        )
         self.check_commits_chooser = RandomChooser([None, True])
         self.run_location = RandomChooser(
             [
@@ -165,6 +169,7 @@ class GenerateCommands(BaseClass):
             run_location = self.cocotb_path
         else:
             run_location = self.run_location.choose_next()
+        compile, jobs = self.compiles_chooser.choose_next()
         #########################################################
 
         command = Command(
@@ -181,7 +186,8 @@ class GenerateCommands(BaseClass):
             macro=self.macros_chooser.choose_next(),
             sim_path=self.sim_paths_chooser.choose_next(),
             verbosity=self.verbosities_chooser.choose_next(),
-            compile=self.compiles_chooser.choose_next(),
+            compile=compile,
+            jobs=jobs,
             check_commits=self.check_commits_chooser.choose_next(),
             run_location=run_location,
             CI=True,
@@ -222,10 +228,11 @@ class GenerateCommands(BaseClass):
             f" -verbosity {command.verbosity} " if command.verbosity is not None else ""
         )
         compile = " -compile" if command.compile is not None else ""
+        jobs = f" -jobs {command.jobs} " if command.jobs is not None else ""
         CI = " --CI" if command.CI is not None else ""
         # check_commits = " -check_commits" if command.check_commits is not None else ""
         # TODO for now remove using {check_commits}
-        command = f"cd {command.run_location}  && caravel_cocotb {test}{design_info}{sim}{max_error}{corner}{seed}{no_wave}{clk}{macro}{sim_path}{verbosity}{compile}{CI} -tag  {command.tag}"
+        command = f"cd {command.run_location}  && caravel_cocotb {test}{design_info}{sim}{max_error}{corner}{seed}{no_wave}{clk}{macro}{sim_path}{verbosity}{compile}{jobs}{CI} -tag  {command.tag}"
         return command
 
 
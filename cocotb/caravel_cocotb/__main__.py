@@ -112,6 +112,13 @@ def main():
         nargs="+",
         help="directory where sdf files exists, script should unzip files in these directories",
     )
+    parser.add_argument(
+        "-jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="number of tests to run in parallel (iverilog only), 0 uses all cores except 2. default = 1",
+    )
     parser.add_argument("--progress", action="store_true", help=argparse.SUPPRESS)   # used only for external CI to run docker in non interactive mode
     parser.add_argument("--compile_only", action="store_true", help=argparse.SUPPRESS)   # used to only compile without running
     parser.add_argument("--no_scratch", action="store_true", help=argparse.SUPPRESS)   # used to disable use scratch area
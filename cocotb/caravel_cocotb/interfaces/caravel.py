@@ -10,7 +10,6 @@ import caravel_cocotb.interfaces.common as common
 from caravel_cocotb.interfaces.common import GPIO_MODE
 from caravel_cocotb.interfaces.common import MASK_GPIO_CTRL
 from collections.abc import Iterable
-from collections import namedtuple
 
 
 def gpio_mode(gpios_values: list):
@@ -45,15 +44,14 @@ class Caravel_env:
         )  # number of active gpios
         if "OPENFRAME" in self.design_macros._asdict():
             self.active_gpios_num = int(self.design_macros.OPENFRAME_IO_PADS)
+        # testbench gpio drivers resolved once, indexed by gpio number
+        self._gpio = [dut._id(f"gpio{i}", False) for i in range(self.active_gpios_num)]
+        self._gpio_en = [
+            dut._id(f"gpio{i}_en", False) for i in range(self.active_gpios_num)
+        ]
 
     def get_macros(self):
-        valid_macros = {
-            k: v
-            for k, v in cocotb.plusargs.items()
-            if not k.startswith("_") and "+" not in k
-        }
-        Macros = namedtuple("Macros", valid_macros.keys())
-        self.design_macros = Macros(**valid_macros)
+        self.design_macros = common.get_design_macros()
 
     """start carvel by insert power then reset"""
 
@@ -68,7 +66,7 @@ class Caravel_env:
         for i in range(self.active_gpios_num):
             if i in ignore_bins:  # CSB and SCK
                 continue
-            common.drive_hdl(self.dut._id(f"gpio{i}_en", False), (0, 0), 0)
+            common.drive_hdl(self._gpio_en[i], (0, 0), 0)
         await ClockCycles(self.clk, 1)
 
     async def power_up(self):
@@ -454,14 +452,14 @@ class Caravel_env:
                 value=data, n_bits=bits[0] - bits[1] + 1, bigEndian=(bits[0] < bits[1])
             )
             for i, bits2 in enumerate(range(bits[1], bits[0] + 1)):
-                self.dut._id(f"gpio{bits2}", False).value = data_bits[i]
-                self.dut._id(f"gpio{bits2}_en", False).value = 1
+                self._gpio[bits2].value = data_bits[i]
+                self._gpio_en[bits2].value = 1
                 cocotb.log.debug(
                     f"[caravel] [drive_gpio_in] drive gpio{bits2} with {data_bits[i]} and gpio{bits2}_en with 1"
                 )
         else:
-            self.dut._id(f"gpio{bits}", False).value = data
-            self.dut._id(f"gpio{bits}_en", False).value = 1
+            self._gpio[bits].value = data
+            self._gpio_en[bits].value = 1
             cocotb.log.debug(
                 f"[caravel] [drive_gpio_in] drive gpio{bits} with {data} and gpio{bits}_en with 1"
             )
@@ -477,12 +475,12 @@ class Caravel_env:
                 f"[caravel] [drive_gpio_disable] start bits[1] = {bits[1]} bits[0]= {bits[0]}"
             )
             for i, bits2 in enumerate(range(bits[1], bits[0] + 1)):
-                self.dut._id(f"gpio{bits2}_en", False).value = 0
+                self._gpio_en[bits2].value = 0
                 cocotb.log.debug(
                     f"[caravel] [drive_gpio_disable] release driving gpio{bits2}"
                 )
         else:
-            self.dut._id(f"gpio{bits}_en", False).value = 0
+            self._gpio_en[bits].value = 0
             cocotb.log.debug(
                 f"[caravel] [drive_gpio_disable] release driving gpio{bits}"
             )
@@ -1,8 +1,10 @@
 from cocotb.handle import SimHandleBase
 from cocotb.binary import BinaryValue
 from enum import Enum
+from collections import namedtuple
 import cocotb
 import os
+import re
 
 """return the value and the size of the signal"""
 
@@ -46,6 +48,23 @@ def drive_hdl(path, bits, data):
     cocotb.log.debug(f" [common] drive { path._path }  with {hdl}")
 
 
+_cached_macros = None
+# design macros are the plusargs not starting with "_" and not containing "+"
+_MACRO_RE = re.compile(r"[^_+][^+]*")
+
+
+def get_design_macros():
+    """return the design macros passed as plusargs, parsed once per simulation"""
+    global _cached_macros
+    if _cached_macros is None:
+        valid_macros = {
+            k: v for k, v in cocotb.plusargs.items() if _MACRO_RE.fullmatch(k)
+        }
+        Macros = namedtuple("Macros", valid_macros.keys())
+        _cached_macros = Macros(**valid_macros)
+    return _cached_macros
+
+
 """Enum for GPIO modes valus used to configured the pins"""
 tag = os.getenv("RUNTAG")
 # config_file = f"sim.{tag.replace('/','.')}.configs" // TODO: fix this
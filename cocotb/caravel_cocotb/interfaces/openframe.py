@@ -12,14 +12,63 @@ It has:
 """
 
 import cocotb
+from cocotb import simulator
 from cocotb.clock import Clock
 from cocotb.triggers import FallingEdge, RisingEdge, ClockCycles
 import cocotb.log
+import functools
 from cocotb.handle import SimHandleBase
 from cocotb.binary import BinaryValue
-from collections import namedtuple
 import caravel_cocotb.interfaces.common as common
 
+# Testbench power pins, MSB first as packed into power_bus_tb, and whether
+# each one is a supply (driven with the power value) or a ground (always 0)
+_POWER_PINS = (
+    ("vddio_tb", 1),
+    ("vssio_tb", 0),
+    ("vdda_tb", 1),
+    ("vssa_tb", 0),
+    ("vccd_tb", 1),
+    ("vssd_tb", 0),
+    ("vdda1_tb", 1),
+    ("vdda2_tb", 1),
+    ("vssa1_tb", 0),
+    ("vssa2_tb", 0),
+    ("vccd1_tb", 1),
+    ("vccd2_tb", 1),
+    ("vssd1_tb", 0),
+    ("vssd2_tb", 0),
+)
+_POWER_ON_MASK = int("".join(str(supply) for _, supply in _POWER_PINS), 2)
+
+
+class _SignalProxy:
+    """
+    Thin wrapper around the GPI handle of a scalar testbench signal.
+
+    Reads go straight to the simulator as integers, skipping the ``BinaryValue``
+    construction done by ``handle.value``. Writes go through ``handle.value`` so
+    they are scheduled (applied in the ReadWrite phase) like any other write.
+    The simulator reads a 32-bit signed integer and gives 0 for X/Z bits rather
+    than raising, so signals of 32 bits or more are read through ``handle.value``.
+    """
+
+    __slots__ = ("_handle", "_hdl")
+
+    def __init__(self, handle: SimHandleBase):
+        self._handle = handle
+        self._hdl = handle._handle if len(handle) < 32 else None
+
+    def set_int(self, value: int):
+        self._handle.value = value
+
+    def get_int(self) -> int:
+        """Read the signal as an integer, unresolvable (X/Z) values read as 0."""
+        if self._hdl is not None:
+            return self._hdl.get_signal_val_long()
+        val = self._handle.value
+        return int(val) if val.is_resolvable else 0
+
 
 class OpenFrame_env:
     """
@@ -38,16 +87,25 @@ class OpenFrame_env:
         self.active_gpios_num = 44  # OpenFrame has 44 GPIOs
         if "OPENFRAME_IO_PADS" in self.design_macros._asdict():
             self.active_gpios_num = int(self.design_macros.OPENFRAME_IO_PADS)
+        # per-GPIO testbench handles, resolved on first use and then reused
+        self._en = self._lazy_proxies("gpio{}_en")
+        self._val = self._lazy_proxies("gpio{}")
+        self._mon = self._lazy_proxies("gpio{}_monitor")
+        self._range_cache = {}
+        self._vdd_on, self._vdd_off = self._power_setters()
+
+    def _lazy_proxies(self, name: str):
+        """Return a memoized ``gpio_num -> _SignalProxy`` lookup for one handle kind."""
+
+        @functools.lru_cache(maxsize=None)
+        def proxy(gpio_num: int) -> _SignalProxy:
+            return _SignalProxy(self.dut._id(name.format(gpio_num), False))
+
+        return proxy
 
     def get_macros(self):
         """Get design macros from plusargs."""
-        valid_macros = {
-            k: v
-            for k, v in cocotb.plusargs.items()
-            if not k.startswith("_") and "+" not in k
-        }
-        Macros = namedtuple("Macros", valid_macros.keys())
-        self.design_macros = Macros(**valid_macros)
+        self.design_macros = common.get_design_macros()
 
     async def start_up(self):
         """Start OpenFrame by inserting power then reset."""
@@ -56,9 +114,16 @@ class OpenFrame_env:
         await self.disable_gpio_drivers()
 
     async def disable_gpio_drivers(self):
-        """Disable all GPIO testbench drivers."""
-        for i in range(self.active_gpios_num):
-            common.drive_hdl(self.dut._id(f"gpio{i}_en", False), (0, 0), 0)
+        """
+        Disable all GPIO testbench drivers.
+
+        Testbenches that initialize their ``gpioN_en`` registers to 0
+        (``reg gpioN_en = 0;``) can define the ``GPIO_EN_DEFAULT_OFF`` macro to
+        skip writing every enable at startup.
+        """
+        if "GPIO_EN_DEFAULT_OFF" not in self.design_macros._asdict():
+            for i in range(self.active_gpios_num):
+                self._en(i).set_int(0)
         await ClockCycles(self.clk, 1)
 
     async def power_up(self):
@@ -81,24 +146,71 @@ class OpenFrame_env:
 
     def set_vdd(self, value: bool):
         """Set power supply values."""
-        self.dut.vddio_tb.value = value
-        self.dut.vssio_tb.value = 0
-        self.dut.vdda_tb.value = value
-        self.dut.vssa_tb.value = 0
-        self.dut.vccd_tb.value = value
-        self.dut.vssd_tb.value = 0
-        self.dut.vdda1_tb.value = value
-        self.dut.vdda2_tb.value = value
-        self.dut.vssa1_tb.value = 0
-        self.dut.vssa2_tb.value = 0
-        self.dut.vccd1_tb.value = value
-        self.dut.vccd2_tb.value = value
-        self.dut.vssd1_tb.value = 0
-        self.dut.vssd2_tb.value = 0
-
-    def setup_clock(self, period_ns: int):
-        """Setup the clock with the given period in nanoseconds."""
+        (self._vdd_on if value else self._vdd_off)()
+
+    def _power_setters(self):
+        """
+        Build the power on/off callables once, as the rail pattern is fixed.
+
+        Uses a single write when the testbench declares ``reg [13:0] power_bus_tb``
+        driving the pins, i.e. the pins are wires assigned from the bus
+        (``assign {vddio_tb, vssio_tb, ..., vssd1_tb, vssd2_tb} = power_bus_tb;``).
+        The write goes from the bus to the pins only, so a ``power_bus_tb`` that is
+        itself a wire concatenation of the pin regs is ignored and each pin is
+        driven instead, as it is when there is no bus.
+        """
+        try:
+            bus = self.dut._id("power_bus_tb", False)
+        except AttributeError:
+            bus = None
+        if (
+            bus is not None
+            and bus._handle.get_type() == simulator.REG
+            and len(bus) == len(_POWER_PINS)
+        ):
+
+            def vdd_on():
+                bus.value = _POWER_ON_MASK
+
+            def vdd_off():
+                bus.value = 0
+
+            return vdd_on, vdd_off
+
+        pins = [(self.dut._id(pin, False), supply) for pin, supply in _POWER_PINS]
+
+        def vdd_on():
+            for hdl, supply in pins:
+                hdl.value = supply
+
+        def vdd_off():
+            for hdl, _ in pins:
+                hdl.value = 0
+
+        return vdd_on, vdd_off
+
+    def setup_clock(self, period_ns: int, hdl_side: bool = True):
+        """
+        Setup the clock with the given period in nanoseconds.
+
+        When ``hdl_side`` is set and the testbench top has a ``clock_period_tb``
+        register feeding a Verilog clock generator
+        (``always #(clock_period_tb / 2) clock_tb = ~clock_tb;``), only the period
+        is written and the clock toggles without going through the cocotb scheduler.
+        Otherwise a cocotb ``Clock`` coroutine drives ``clock_tb``.
+
+        :param int period_ns: Clock period in nanoseconds
+        :param bool hdl_side: Prefer the testbench clock generator when available
+        """
         cocotb.log.info(f" [openframe] setting up clock with period {period_ns}ns")
+        if hdl_side:
+            try:
+                self.dut._id("clock_period_tb", False).value = period_ns
+                return
+            except AttributeError:
+                cocotb.log.debug(
+                    " [openframe] no HDL clock generator found, driving clock from cocotb"
+                )
         cocotb.start_soon(Clock(self.clk, period_ns, units="ns").start())
 
     def drive_gpio(self, gpio_num: int, value: int):
@@ -111,8 +223,8 @@ class OpenFrame_env:
         if gpio_num >= self.active_gpios_num:
             cocotb.log.error(f"[openframe] GPIO {gpio_num} is out of range (max {self.active_gpios_num-1})")
             return
-        common.drive_hdl(self.dut._id(f"gpio{gpio_num}_en", False), (0, 0), 1)
-        common.drive_hdl(self.dut._id(f"gpio{gpio_num}", False), (0, 0), value)
+        self._en(gpio_num).set_int(1)
+        self._val(gpio_num).set_int(value)
         cocotb.log.debug(f"[openframe] drive GPIO[{gpio_num}] = {value}")
 
     def drive_gpio_range(self, gpio_range: tuple, value: int):
@@ -123,9 +235,30 @@ class OpenFrame_env:
         :param int value: Value to drive
         """
         high, low = gpio_range
-        for i in range(low, high + 1):
-            bit_value = (value >> (i - low)) & 1
-            self.drive_gpio(i, bit_value)
+        if high >= self.active_gpios_num:
+            cocotb.log.error(f"[openframe] GPIO {high} is out of range (max {self.active_gpios_num-1})")
+            return
+        v = value
+        for en, val in zip(
+            self._range_proxies(self._en, high, low),
+            self._range_proxies(self._val, high, low),
+        ):
+            en.set_int(1)
+            val.set_int(v & 1)
+            v >>= 1
+        cocotb.log.debug(f"[openframe] drive GPIO[{high}:{low}] = {value:#x}")
+
+    def _range_proxies(self, proxy, high: int, low: int) -> list:
+        """Return the cached proxies of a GPIO range, lowest GPIO first.
+
+        :param proxy: one of the ``_en``, ``_val`` or ``_mon`` lookups
+        """
+        key = (proxy, high, low)
+        proxies = self._range_cache.get(key)
+        if proxies is None:
+            proxies = [proxy(i) for i in range(low, high + 1)]
+            self._range_cache[key] = proxies
+        return proxies
 
     def release_gpio(self, gpio_num: int):
         """
@@ -136,7 +269,7 @@ class OpenFrame_env:
         if gpio_num >= self.active_gpios_num:
             cocotb.log.error(f"[openframe] GPIO {gpio_num} is out of range")
             return
-        common.drive_hdl(self.dut._id(f"gpio{gpio_num}_en", False), (0, 0), 0)
+        self._en(gpio_num).set_int(0)
         cocotb.log.debug(f"[openframe] release GPIO[{gpio_num}]")
 
     def release_gpio_range(self, gpio_range: tuple):
@@ -146,8 +279,12 @@ class OpenFrame_env:
         :param tuple gpio_range: (high_gpio, low_gpio) tuple
         """
         high, low = gpio_range
-        for i in range(low, high + 1):
-            self.release_gpio(i)
+        if high >= self.active_gpios_num:
+            cocotb.log.error(f"[openframe] GPIO {high} is out of range")
+            return
+        for en in self._range_proxies(self._en, high, low):
+            en.set_int(0)
+        cocotb.log.debug(f"[openframe] release GPIO[{high}:{low}]")
 
     def monitor_gpio(self, gpio_num: int) -> int:
         """
@@ -159,8 +296,7 @@ class OpenFrame_env:
         if gpio_num >= self.active_gpios_num:
             cocotb.log.error(f"[openframe] GPIO {gpio_num} is out of range")
             return 0
-        val = self.dut._id(f"gpio{gpio_num}_monitor", False).value
-        return int(val) if val.is_resolvable else 0
+        return self._mon(gpio_num).get_int()
 
     def monitor_gpio_range(self, gpio_range: tuple) -> int:
         """
@@ -170,8 +306,12 @@ class OpenFrame_env:
         :return: Combined value of GPIO range
         """
         high, low = gpio_range
-        value = 0
-        for i in range(low, high + 1):
-            bit_value = self.monitor_gpio(i)
-            value |= (bit_value << (i - low))
-        return value
+        if high >= self.active_gpios_num:
+            cocotb.log.error(f"[openframe] GPIO {high} is out of range")
+            return 0
+        if high < low:  # empty range
+            return 0
+        bits = bytearray((high - low + 8) // 8)
+        for bit, mon in enumerate(self._range_proxies(self._mon, high, low)):
+            bits[bit >> 3] |= mon.get_int() << (bit & 7)
+        return int.from_bytes(bits, "little")
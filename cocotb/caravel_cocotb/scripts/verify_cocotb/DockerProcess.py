@@ -1,7 +1,20 @@
 import subprocess
+import hashlib
 import os
+import shlex
+import shutil
 import sys
 
+try:
+    import docker
+    import requests  # dependency of the docker SDK, raised for connection errors
+
+    # errors of an SDK call, including a daemon that went away after from_env()
+    _SDK_ERRORS = (docker.errors.DockerException, requests.exceptions.RequestException)
+except ImportError:  # the docker SDK is optional, the docker CLI is used otherwise
+    docker = None
+    _SDK_ERRORS = ()
+
 
 class DockerProcess:
     """Handles Docker image management with cleaner output."""
@@ -12,53 +25,236 @@ class DockerProcess:
     RED = "\033[91m"
     DIM = "\033[2m"
     ENDC = "\033[0m"
+
+    # labels recording which requirements.txt and base image a custom image was built from
+    REQUIREMENTS_LABEL = "caravel_cocotb.requirements_hash"
+    BASE_IMAGE_LABEL = "caravel_cocotb.base_image_id"
+    BASE_IMAGE = "chipfoundry/dv:cocotb"
+
+    # image name -> whether it exists locally, inspected once per process
+    _inspect_cache = {}
+    # storage driver reported by the docker daemon, queried once per process
+    _daemon_driver = None
     
     def __init__(self, image_name, user_project_path=None, sim_path=None, quiet=False) -> None:
         self.image_name = image_name
         self.user_project_path = user_project_path
         self.sim_path = sim_path
+        self.requirements_file = f"{user_project_path}/verilog/dv/cocotb/requirements.txt"
         self.quiet = quiet
         self.use_colors = sys.stdout.isatty()
-
-    def _print(self, msg, color="", dim=False):
-        """Print with optional color, respecting quiet mode."""
+        # pick the print implementation once instead of branching on every message
         if self.quiet:
-            return
-        if self.use_colors and color:
+            self._print = lambda msg, color="", dim=False: None
+        elif self.use_colors:
+            self._print = self._print_colored
+        else:
+            self._print = self._print_plain
+        self.client = self._docker_client()
+
+    @staticmethod
+    def _docker_client():
+        """Return a docker SDK client sharing one daemon connection, if available."""
+        if docker is None:
+            return None
+        try:
+            return docker.from_env()
+        except _SDK_ERRORS:
+            return None
+
+    def _print_colored(self, msg, color="", dim=False):
+        """Print with optional color."""
+        if color:
             print(f"{color}{msg}{self.ENDC}")
-        elif self.use_colors and dim:
+        elif dim:
             print(f"{self.DIM}{msg}{self.ENDC}")
         else:
             print(msg)
 
+    @staticmethod
+    def _print_plain(msg, color="", dim=False):
+        print(msg)
+
     def run(self):
+        # without the SDK every docker step is a CLI spawn, batch them into one shell
+        if self.client is None and not self._soci_available():
+            return self._run_cli_pipeline()
         # pull/update docker image
         self.pull_docker_image()
         # update docker image with pip commands if requirements.txt exists
-        if os.path.exists(
-            f"{self.user_project_path}/verilog/dv/cocotb/requirements.txt"
-        ):
+        if os.path.exists(self.requirements_file):
+            base_image_id = self._base_image_id()
+            requirements_hash = self._requirements_hash(base_image_id)
+            custom_image = self._custom_image(requirements_hash)
+            # a previous build from the same base and requirements is kept under its own tag
+            if self._image_label(self.REQUIREMENTS_LABEL, custom_image) == requirements_hash:
+                self._print("Docker image already has the custom requirements.", dim=True)
+                self._tag_image(custom_image)
+                return
             self.write_docker_file()
-            self.build_docker_image()
+            self.build_docker_image(requirements_hash, custom_image, base_image_id)
 
-    def pull_docker_image(self):
-        # Check if the image exists locally
+    def _run_cli_pipeline(self):
+        """Inspect and pull the image from a single shell, then tag or build the custom image from another."""
+        image = shlex.quote(self.image_name)
+        pull = [
+            f"if docker image inspect {image} >/dev/null 2>&1; then",
+            "  " + self._echo("Checking for docker image updates...", self.DIM),
+            f"  docker pull -q {image} >/dev/null 2>&1 || "
+            + self._echo(f"Error: Failed to pull {self.image_name}", self.RED),
+            "else",
+            "  " + self._echo(f"Pulling docker image {self.image_name}...", self.CYAN),
+            f"  docker pull {image} || "
+            + self._echo(f"Error: Failed to pull {self.image_name}", self.RED),
+            "fi",
+        ]
+        steps = ["command -v docker >/dev/null 2>&1 || exit 127", *pull]
+        result = subprocess.run(["sh", "-c", "\n".join(steps)])
+        if result.returncode == 127:
+            self._print("Error: Docker is not installed.", color=self.RED)
+            self._print("Please install Docker and try again.")
+            exit(1)
+        DockerProcess._inspect_cache[self.image_name] = True
+        if not os.path.exists(self.requirements_file):
+            return
+        # the hash depends on the pulled base image, so this needs a second shell
+        base_image_id = self._base_image_id()
+        requirements_hash = self._requirements_hash(base_image_id)
+        custom_image = shlex.quote(self._custom_image(requirements_hash))
+        label = f'{{{{ index .Config.Labels "{self.REQUIREMENTS_LABEL}" }}}}'
+        dockerfile = shlex.quote(f"{self.sim_path}/Dockerfile")
+        labels = " ".join(
+            f"--label={k}={shlex.quote(v)}" for k, v in self._build_labels(requirements_hash, base_image_id).items()
+        )
+        steps = [
+            f'if [ "$(docker image inspect -f {shlex.quote(label)} {custom_image} 2>/dev/null)" = {requirements_hash} ]; then',
+            "  " + self._echo("Docker image already has the custom requirements.", self.DIM),
+            f"  docker tag {custom_image} {image}",
+            "else",
+            # the Dockerfile is only written when a build is needed
+            f"  cat > {dockerfile} <<'CARAVEL_COCOTB_EOF'",
+            self._docker_file_text(),
+            "CARAVEL_COCOTB_EOF",
+            "  " + self._echo("Building docker image with custom requirements...", self.DIM),
+            f"  if docker build -q -t {image} -t {custom_image} -f {dockerfile} {labels} . >/dev/null; then",
+            "    " + self._echo("Docker image ready.", self.GREEN),
+            "  else",
+            "    " + self._echo("Error building Docker image", self.RED),
+            "  fi",
+            "fi",
+        ]
+        subprocess.run(["sh", "-c", "\n".join(steps)])
+
+    def _echo(self, msg, color=""):
+        """Shell statement printing a status message like _print would."""
+        if self.quiet:
+            return ":"
+        if self.use_colors and color:
+            msg = f"{color}{msg}{self.ENDC}"
+        return f"printf '%s\\n' {shlex.quote(msg)}"
+
+    def _requirements_hash(self, base_image_id):
+        """Hash of requirements.txt and the ID of the base image the custom image is built on."""
+        with open(self.requirements_file, "rb") as f:
+            digest = hashlib.sha256(f.read())
+        digest.update(self.BASE_IMAGE.encode())
+        digest.update((base_image_id or "").encode())
+        return digest.hexdigest()
+
+    def _custom_image(self, requirements_hash):
+        """Name the custom build is also tagged with, pulls of image_name don't replace it."""
+        return f"{self.image_name}-{requirements_hash[:12]}"
+
+    def _build_labels(self, requirements_hash, base_image_id):
+        labels = {self.REQUIREMENTS_LABEL: requirements_hash}
+        if base_image_id:
+            labels[self.BASE_IMAGE_LABEL] = base_image_id
+        return labels
+
+    def _base_image_id(self):
+        """Return the ID of the upstream image behind image_name, None if it is missing.
+
+        A pull normally points image_name back to the upstream image. If it failed, the
+        name may still point to a custom build, whose label records its base image.
+        """
+        if self.client is not None:
+            try:
+                image = self.client.images.get(self.image_name)
+            except _SDK_ERRORS:
+                return None
+            return image.labels.get(self.BASE_IMAGE_LABEL) or image.id
+        return self._inspect(f'{{{{ or (index .Config.Labels "{self.BASE_IMAGE_LABEL}") .Id }}}}', self.image_name)
+
+    def _image_label(self, key, image_name=None):
+        """Return a label of a local image, None if the image or label is missing."""
+        image_name = image_name or self.image_name
+        if self.client is not None:
+            try:
+                return self.client.images.get(image_name).labels.get(key)
+            except _SDK_ERRORS:
+                return None
+        return self._inspect(f'{{{{ index .Config.Labels "{key}" }}}}', image_name)
+
+    @staticmethod
+    def _inspect(template, image_name):
+        """Return `docker image inspect -f template`, None if it fails or is empty."""
         try:
-            subprocess.run(
-                ["docker", "inspect", self.image_name],
-                check=True,
+            result = subprocess.run(
+                [
+                    "docker",
+                    "image",
+                    "inspect",
+                    "-f",
+                    template,
+                    image_name,
+                ],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
+                universal_newlines=True,
             )
-            self._print(f"Checking for docker image updates...", dim=True)
-            command = ["docker", "pull", "-q", f"{self.image_name}"]
-        except subprocess.CalledProcessError:
-            self._print(f"Pulling docker image {self.image_name}...", color=self.CYAN)
-            command = ["docker", "pull", f"{self.image_name}"]
+        except FileNotFoundError:  # docker missing, reported by pull_docker_image
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+
+    def _tag_image(self, source):
+        """Point image_name at the local image source."""
+        if self.client is not None:
+            try:
+                self.client.images.get(source).tag(*self._split_reference(self.image_name))
+            except _SDK_ERRORS as e:
+                self._print(f"Error tagging {source} as {self.image_name}: {e}", color=self.RED)
+        else:
+            subprocess.run(["docker", "tag", source, self.image_name])
+        DockerProcess._inspect_cache[self.image_name] = True
+
+    @staticmethod
+    def _split_reference(name):
+        """Split an image reference into repository and tag (None if untagged)."""
+        repository, sep, tag = name.rpartition(":")
+        if not sep or "/" in tag:  # a registry port, not a tag
+            return name, None
+        return repository, tag
+
+    def pull_docker_image(self):
+        if self._soci_available() and self._pull_docker_image_soci():
+            return
+        if self.client is not None:
+            return self._pull_docker_image_sdk()
+        # Check if the image exists locally
+        try:
+            image_exists = self._image_exists()
         except FileNotFoundError:
             self._print("Error: Docker is not installed.", color=self.RED)
             self._print("Please install Docker and try again.")
             exit(1)
+        if image_exists:
+            self._print(f"Checking for docker image updates...", dim=True)
+            command = ["docker", "pull", "-q", f"{self.image_name}"]
+        else:
+            self._print(f"Pulling docker image {self.image_name}...", color=self.CYAN)
+            command = ["docker", "pull", f"{self.image_name}"]
         try:
             # Run the docker pull command (suppress output in quiet pull mode)
             result = subprocess.run(
@@ -67,46 +263,168 @@ class DockerProcess:
                 stdout=subprocess.PIPE if "-q" in command else None,
                 stderr=subprocess.PIPE if "-q" in command else None,
             )
+            DockerProcess._inspect_cache[self.image_name] = True
         except subprocess.CalledProcessError as e:
             self._print(f"Error: Failed to pull {self.image_name}", color=self.RED)
             if not self.quiet:
                 print(e)
 
-    def build_docker_image(self):
+    def _image_exists(self):
+        """Check if the image exists locally, inspecting it once per process."""
+        if self.image_name not in DockerProcess._inspect_cache:
+            exists = None
+            if self.client is not None:
+                try:
+                    self.client.images.get(self.image_name)
+                    exists = True
+                except docker.errors.ImageNotFound:
+                    exists = False
+                except _SDK_ERRORS:
+                    pass  # daemon unreachable through the SDK, ask the CLI
+            if exists is None:
+                exists = (
+                    subprocess.run(
+                        ["docker", "inspect", self.image_name],
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                    ).returncode
+                    == 0
+                )
+            DockerProcess._inspect_cache[self.image_name] = exists
+        return DockerProcess._inspect_cache[self.image_name]
+
+    def _soci_available(self):
+        """Check that docker stores images through the SOCI snapshotter (parallel, lazily fetched layers).
+
+        Pulling with nerdctl into the moby namespace only helps when dockerd uses the
+        containerd image store with the soci snapshotter, check the daemon's driver
+        besides the binaries.
+        """
+        return (
+            shutil.which("nerdctl") is not None
+            and shutil.which("soci-snapshotter-grpc") is not None
+            and self._docker_driver() == "soci"
+        )
+
+    def _docker_driver(self):
+        """Return the daemon's storage driver (the snapshotter with the containerd store)."""
+        if DockerProcess._daemon_driver is None:
+            driver = ""
+            if self.client is not None:
+                try:
+                    driver = self.client.info().get("Driver", "")
+                except _SDK_ERRORS:
+                    pass
+            else:
+                try:
+                    result = subprocess.run(
+                        ["docker", "info", "-f", "{{.Driver}}"],
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        universal_newlines=True,
+                    )
+                    if result.returncode == 0:
+                        driver = result.stdout.strip()
+                except FileNotFoundError:
+                    pass
+            DockerProcess._daemon_driver = driver
+        return DockerProcess._daemon_driver
+
+    def _pull_docker_image_soci(self):
+        """Pull through nerdctl into the containerd namespace used by docker.
+
+        Return False on failure so the regular docker pull is used instead.
+        """
+        self._print(f"Pulling docker image {self.image_name} (soci)...", dim=True)
+        result = subprocess.run(
+            [
+                "nerdctl",
+                "--namespace",
+                "moby",
+                "--snapshotter",
+                "soci",
+                "pull",
+                "-q",
+                self.image_name,
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        return result.returncode == 0
+
+    def _pull_docker_image_sdk(self):
         try:
-            self._print(f"Building docker image with custom requirements...", dim=True)
+            image_exists = self._image_exists()
+        except FileNotFoundError:  # SDK failed and no docker CLI, report it through the pull
+            image_exists = False
+        if image_exists:
+            self._print("Checking for docker image updates...", dim=True)
+        else:
+            self._print(f"Pulling docker image {self.image_name}...", color=self.CYAN)
+        try:
+            self.client.images.pull(self.image_name)
+            DockerProcess._inspect_cache[self.image_name] = True
+        except _SDK_ERRORS as e:
+            self._print(f"Error: Failed to pull {self.image_name}", color=self.RED)
+            if not self.quiet:
+                print(e)
+
+    def build_docker_image(self, requirements_hash=None, custom_image=None, base_image_id=None):
+        labels = self._build_labels(requirements_hash, base_image_id) if requirements_hash else {}
+        tags = [self.image_name, custom_image] if custom_image else [self.image_name]
+        if self.client is not None:
+            return self._build_docker_image_sdk(labels, tags)
+        try:
+            self._print("Building docker image with custom requirements...", dim=True)
             # Build the Docker image using subprocess (capture output)
             result = subprocess.run(
                 [
                     "docker",
                     "build",
-                    "-t",
-                    self.image_name,
+                    *[arg for tag in tags for arg in ("-t", tag)],
                     "-f",
                     f"{self.sim_path}/Dockerfile",
+                    *[f"--label={k}={v}" for k, v in labels.items()],
                     ".",
                 ],
                 check=True,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
             )
-            self._print(f"Docker image ready.", color=self.GREEN)
+            self._print("Docker image ready.", color=self.GREEN)
         except subprocess.CalledProcessError as e:
             self._print(f"Error building Docker image: {e}", color=self.RED)
 
+    def _build_docker_image_sdk(self, labels, tags):
+        try:
+            self._print("Building docker image with custom requirements...", dim=True)
+            image, _ = self.client.images.build(
+                path=".",
+                dockerfile=f"{self.sim_path}/Dockerfile",
+                tag=tags[0],
+                labels=labels,
+            )
+            for tag in tags[1:]:
+                image.tag(*self._split_reference(tag))
+            self._print("Docker image ready.", color=self.GREEN)
+        except _SDK_ERRORS as e:
+            self._print(f"Error building Docker image: {e}", color=self.RED)
+
     def write_docker_file(self):
         with open(f"{self.sim_path}/Dockerfile", "w") as f:
-            with open("requirements.txt", "r") as file:
-                requirements = file.readlines()
-            requirements = [requirement.strip() for requirement in requirements]
-
-            f.write("# Use the chipfoundry/dv:cocotb base image\n")
-            f.write("FROM chipfoundry/dv:cocotb\n")
-            f.write("\n")
-            # f.write("# Copy requirements.txt into the container\n")
-            # f.write("WORKDIR /app\n")
-            # f.write(f"COPY {self.user_project_path}/verilog/dv/cocotb/requirements.txt .\n")
-            f.write("\n")
-            f.write("# Install additional packages\n")
-            f.write(f"RUN pip install --upgrade {' '.join(requirements)}")
-            f.write("\n")
+            f.write(self._docker_file_text())
+
+    def _docker_file_text(self):
+        with open(self.requirements_file, "r") as file:
+            requirements = file.read().split()
+        return (
+            "# Use the chipfoundry/dv:cocotb base image\n"
+            f"FROM {self.BASE_IMAGE}\n"
+            "\n"
+            # "# Copy requirements.txt into the container\n"
+            # "WORKDIR /app\n"
+            # f"COPY {self.user_project_path}/verilog/dv/cocotb/requirements.txt .\n"
+            "\n"
+            "# Install additional packages\n"
+            f"RUN pip install --upgrade {' '.join(requirements)}\n"
+        )
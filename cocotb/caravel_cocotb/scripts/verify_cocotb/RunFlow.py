@@ -331,6 +331,7 @@ class CocotbArgs:
         no_scratch=False,
         no_gen_defaults=False,
         openframe=False,
+        jobs=1,
     ) -> None:
         self.test = test
         self.sim = sim
@@ -364,6 +365,7 @@ class CocotbArgs:
         self.no_scratch = no_scratch
         self.no_gen_defaults = no_gen_defaults
         self.openframe = openframe
+        self.jobs = jobs
 
     def argparse_to_CocotbArgs(self, args):
         self.test = args.test
@@ -395,4 +397,5 @@ class CocotbArgs:
         self.compile_only = args.compile_only
         self.no_scratch = args.no_scratch
         self.no_gen_defaults = args.no_gen_defaults
-        self.openframe = args.openframe
\ No newline at end of file
+        self.openframe = args.openframe
+        self.jobs = args.jobs
\ No newline at end of file
@@ -23,6 +23,8 @@ from rich.table import Table
 from rich.console import Console
 import glob
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from caravel_cocotb.scripts.verify_cocotb.logging_config import (
     Colors, print_test_header, print_test_result, print_summary_table
 )
@@ -33,6 +35,7 @@ class RunRegression:
         self.paths = paths
         self.logger = logger
         self.is_first_test_run = False
+        self._report_lock = threading.Lock()
         self.total_start_time = datetime.now()
         self.write_command_log()
         self.write_git_log()
@@ -238,21 +241,24 @@ class RunRegression:
     def run_all_tests(self):
         if self.args.compile_only:  # run only the first test to compile
             self.test_run_function(self.tests[0])
+        elif self.args.iverilog and self.jobs() > 1 and not self.args.run_defaults:
+            # tests sharing a compilation directory still compile once, see RunTest._compile_locks
+            with ThreadPoolExecutor(max_workers=self.jobs()) as executor:
+                list(executor.map(self.test_run_function, self.tests))
         else:
             for test in self.tests:
-                if self.args.iverilog:  # threading
-                    # x = threading.Thread(target=self.test_run_function,args=(test,sim_type,corner))
-                    # threads.append(x)
-                    # x.start()
-                    # time.sleep(10)
-                    self.test_run_function(test)
-                else:
-                    self.test_run_function(test)
+                self.test_run_function(test)
                 # run defaults
                 if self.args.run_defaults:
                     self.args.compile = True
                     TestDefaults(self.args, self.paths, self.test_run_function, self.tests, self.logger)
 
+    def jobs(self):
+        """number of tests to run in parallel, 0 means all cores except 2"""
+        if self.args.jobs == 0:
+            return max(1, (os.cpu_count() or 1) - 2)
+        return self.args.jobs
+
     def test_run_function(self, test):
         # Print clean test header (except in quiet mode)
         if self.args.verbosity != "quiet":
@@ -260,12 +266,14 @@ class RunRegression:
         
         test.start_of_test()
         if not self.args.compile_only:
-            self.update_run_log()
-            self.update_live_table()
+            with self._report_lock:
+                self.update_run_log()
+                self.update_live_table()
         RunTest(self.args, self.paths, test, self.logger).run_test()
         if not self.args.compile_only:
-            self.update_run_log()
-            self.update_live_table()
+            with self._report_lock:
+                self.update_run_log()
+                self.update_live_table()
         
         # Print clean test result (except in quiet mode)
         if self.args.verbosity != "quiet" and not self.args.compile_only:
@@ -1,16 +1,499 @@
 import os
+import contextlib
+import fcntl
+import functools
+import mmap
+import platform
+import shlex
 import shutil
 import subprocess
-from caravel_cocotb.scripts.verify_cocotb.read_defines import GetDefines
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import re
 import logging
-import caravel_cocotb
-import hashlib
-from caravel_cocotb.scripts.verify_cocotb.logging_config import OutputFilter, Colors
+import atexit
+from caravel_cocotb.scripts.verify_cocotb.logging_config import Colors
+
+try:
+    import blake3
+except ImportError:  # optional, netlist hashes fall back to hashlib.sha256
+    blake3 = None
+
+try:
+    import hyperscan
+except ImportError:  # optional, the noise filter falls back to re
+    hyperscan = None
+
+# files larger than this are hashed through mmap instead of being read at once
+_HASH_MMAP_THRESHOLD = 1 << 20
+# block size used when reading the output of simulation commands
+_READ_CHUNK_SIZE = 1 << 16
+# Docker Desktop (macOS/Windows) bind mounts go through a slow file sharing layer,
+# relax their consistency there with :cached/:delegated (Linux ignores them anyway)
+_MOUNT_HINTS = platform.system() != "Linux"
+# compiled simulators shared between runs, keyed by the hash of their inputs
+# (CARAVEL_COCOTB_COMPILE_CACHE overrides the location, XDG_CACHE_HOME is honoured)
+_COMPILE_CACHE_DIR = os.environ.get("CARAVEL_COCOTB_COMPILE_CACHE") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "caravel-cocotb",
+    "compile",
+)
+# least recently used compilations beyond this count are removed from the cache
+_COMPILE_CACHE_MAX_ENTRIES = 16
+# X11 forwarding and host networking given to the simulator containers
+_DISPLAY_SWITCHES = " -e DISPLAY=$DISPLAY -v /tmp/.X11-unix:/tmp/.X11-unix -v $HOME/.Xauthority:/.Xauthority --network host --security-opt seccomp=unconfined "
+_INCLUDE_RE = re.compile(rb'`include\s+"([^"]+)"')
+# `include `MACRO, the name is only known after preprocessing
+_MACRO_INCLUDE_RE = re.compile(rb"`include\s+`")
+
+
+@functools.lru_cache(maxsize=None)
+def _scan_ip_fw(user_project_root):
+    """Return the real paths of the fw directories of the IPs under user_project_root/ip.
+
+    The ip tree doesn't change during a run so it's scanned once per process.
+    """
+    ip_root = f"{user_project_root}/ip"
+    fw_list = []
+    if not os.path.exists(ip_root):
+        return tuple(fw_list)
+    for file in os.listdir(ip_root):
+        if os.path.isdir(f"{ip_root}/{file}"):
+            for f in os.listdir(f"{ip_root}/{file}"):
+                if f == "fw":
+                    fw_list.append(os.path.realpath(f"{ip_root}/{file}/{f}"))
+    return tuple(fw_list)
+
+
+def _netlist_fingerprint(netlist):
+    """Return the sorted (path, mtime_ns, size) of every netlist file."""
+    fingerprint = []
+    for file_path in sorted(netlist):
+        try:
+            st = os.stat(file_path)
+            fingerprint.append((file_path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            fingerprint.append((file_path, None, None))
+    return tuple(fingerprint)
+
+
+def _new_hash(hash_algorithm):
+    """Return a hash object, blake3 falls back to sha256 when it isn't installed."""
+    if hash_algorithm == "blake3":
+        if blake3 is not None:
+            return blake3.blake3()
+        hash_algorithm = "sha256"
+    import hashlib
+
+    return getattr(hashlib, hash_algorithm)()
+
+
+def _hash_file(hash_algorithm, file_path):
+    """Return the digest of a single file."""
+    hash_func = _new_hash(hash_algorithm)
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > _HASH_MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hash_func.update(mm)
+        else:
+            hash_func.update(f.read())
+    return hash_func.digest()
+
+
+@functools.lru_cache(maxsize=None)
+def _hash_netlist(fingerprint, hash_algorithm):
+    """Hash the netlist files of fingerprint, tests sharing a netlist hash it once.
+
+    Files are hashed concurrently (hashing releases the GIL) and their digests,
+    in the sorted fingerprint order, are combined into one hash.
+    """
+    file_paths = [file_path for file_path, _, _ in fingerprint]
+    try:
+        if len(file_paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(file_paths))) as pool:
+                digests = list(
+                    pool.map(functools.partial(_hash_file, hash_algorithm), file_paths)
+                )
+        else:
+            digests = [_hash_file(hash_algorithm, file_path) for file_path in file_paths]
+        hash_func = _new_hash(hash_algorithm)
+        for digest in digests:
+            hash_func.update(digest)
+        return hash_func.hexdigest()
+    except FileNotFoundError as e:
+        return f"File not found: {e.filename}"
+    except PermissionError as e:
+        return f"Permission denied: {e.filename}"
+
+
+def _volume(src, dst=None, hint="cached"):
+    """Return the bind mount of src at dst (src by default) for _mount_switches.
+
+    hint is "cached" for directories the container mostly reads and "delegated"
+    for the ones it writes outputs to, only added on Docker Desktop.
+    """
+    return (os.path.normpath(src), os.path.normpath(dst or src), hint)
+
+
+def _mount_switches(mounts):
+    """Return the docker -v switches of mounts, skipping the redundant ones.
+
+    docker bind mounts are recursive so a directory mounted at the same path
+    inside another such mount is already visible, unless its path goes through
+    a symbolic link (the link target wouldn't be visible) or it needs another
+    consistency hint. Repeated destinations are dropped as docker refuses them.
+    """
+    roots = [
+        (src, hint)
+        for src, dst, hint in mounts
+        if src == dst and os.path.realpath(src) == src
+    ]
+    switches = []
+    destinations = set()
+    for src, dst, hint in mounts:
+        if dst in destinations:
+            continue
+        if src == dst and os.path.realpath(src) == src and any(
+            src.startswith(root + os.sep) and (hint == root_hint or not _MOUNT_HINTS)
+            for root, root_hint in roots
+        ):
+            continue
+        destinations.add(dst)
+        suffix = f":{hint}" if _MOUNT_HINTS else ""
+        switches.append(f"-v {src}:{dst}{suffix}")
+    return " ".join(switches)
+
+
+def _hex_command_chain(elf_command, lst_command, hex_command):
+    """Shell command building the elf then its listing and hex concurrently.
+
+    objdump and objcopy only read the elf so they don't have to wait for each
+    other, the command fails if either of them fails.
+    """
+    return (
+        f" {elf_command} && {{ {lst_command} & lst_pid=$!;"
+        f" {hex_command}; hex_status=$?;"
+        f" wait $lst_pid && exit $hex_status; }}"
+    )
+
+
+def _remap_hex_addresses(hex_file):
+    """Rewrite the @10 address markers of a verilog hex file to @00 in place."""
+    with open(hex_file, "rb+") as f:
+        data = f.read()
+        remapped = data.replace(b"@10", b"@00")
+        if remapped != data:
+            f.seek(0)
+            f.write(remapped)
+            f.truncate()
+
+
+@functools.lru_cache(maxsize=1)
+def _build_test_index(tests_root):
+    """Map every C file name under tests_root to its directory.
+
+    Walks top-down like os.walk, so the first file found wins when a name is
+    duplicated.
+    """
+    index = {}
+    stack = [tests_root]
+    while stack:
+        root = stack.pop()
+        sub_dirs = []
+        try:
+            with os.scandir(root) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.path)
+                    elif entry.name.endswith(".c") and not entry.is_dir():
+                        index.setdefault(entry.name, root)
+        except OSError:
+            continue
+        stack.extend(reversed(sub_dirs))
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def _find_symbolic_links(directory):
+    """Return the symbolic links to directories found under directory (links aren't followed)."""
+    sym_links = []
+    stack = [directory]
+    while stack:
+        root = stack.pop()
+        sub_dirs = []
+        try:
+            with os.scandir(root) as it:
+                for entry in it:
+                    if entry.is_symlink():
+                        if entry.is_dir():
+                            sym_links.append(entry.path)
+                    elif entry.is_dir():
+                        sub_dirs.append(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(sub_dirs))
+    return tuple(sym_links)
+
+
+def _include_closure(roots, include_dirs):
+    """Return roots and every file they pull in through nested `include, transitively.
+
+    Names are resolved like iverilog does (working directory plus -I dirs), the
+    including file's directory is also tried. Unresolved names are returned as is.
+    A file including through a macro name can pull in anything from those
+    directories, so in that case all of their files are treated as included.
+    """
+    found = list(roots)
+    seen = set(roots)
+    pending = list(roots)
+    while pending:
+        file_path = pending.pop()
+        try:
+            with open(file_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size > _HASH_MMAP_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        names = [m.group(1) for m in _INCLUDE_RE.finditer(mm)]
+                        macro_include = _MACRO_INCLUDE_RE.search(mm) is not None
+                else:
+                    data = f.read()
+                    names = _INCLUDE_RE.findall(data)
+                    macro_include = _MACRO_INCLUDE_RE.search(data) is not None
+        except OSError:
+            continue
+        if macro_include:
+            for directory in (*include_dirs, os.path.dirname(file_path)):
+                try:
+                    with os.scandir(directory) as it:
+                        names += sorted(os.fsencode(entry.path) for entry in it if entry.is_file())
+                except OSError:
+                    continue
+        for name in map(os.fsdecode, names):
+            resolved = False
+            for directory in (*include_dirs, os.path.dirname(file_path)):
+                candidate = os.path.normpath(os.path.join(directory, name))
+                if os.path.isfile(candidate):
+                    resolved = True
+                    break
+            if not resolved:
+                candidate = name
+            if candidate not in seen:
+                seen.add(candidate)
+                found.append(candidate)
+                if resolved:
+                    pending.append(candidate)
+    return found
+
+
+@functools.lru_cache(maxsize=None)
+def _toolchain_id(docker_image, no_docker):
+    """Identify the iverilog that compiles: the image ID, or the host binary and its version."""
+    if no_docker:
+        iverilog = shutil.which("iverilog")
+        if iverilog is None:
+            return None
+        command = [iverilog, "-V"]
+    else:
+        command = ["docker", "image", "inspect", "-f", "{{.Id}}", docker_image]
+    try:
+        result = subprocess.run(
+            command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True
+        )
+    except OSError:
+        return None
+    lines = result.stdout.splitlines()
+    if not lines or (not no_docker and result.returncode != 0):
+        return None
+    return f"{command[0]} {lines[0].strip()}"
+
+
+def _prune_compile_cache(cache_root, keep):
+    """Remove the least recently used cache entries beyond keep, skipping ones in use."""
+    try:
+        with os.scandir(cache_root) as it:
+            entries = [(entry.stat().st_mtime, entry.path) for entry in it if entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return
+    entries.sort(reverse=True)
+    for _, entry_path in entries[keep:]:
+        try:
+            with open(f"{entry_path}/.lock", "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                shutil.rmtree(entry_path)
+        except OSError:  # locked by a compilation or already removed
+            continue
+
+
+@contextlib.contextmanager
+def _locked_dir(directory):
+    """Create directory and hold an exclusive flock on it, also across processes."""
+    os.makedirs(directory, exist_ok=True)
+    with open(f"{directory}/.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield directory
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@functools.lru_cache(maxsize=None)
+def _scratch_exists():
+    """Whether the /mnt/scratch area is there, checked once per run."""
+    return os.path.exists("/mnt/scratch/")
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(directory):
+    """Create directory once per run, it isn't removed while tests are running."""
+    os.makedirs(directory, exist_ok=True)
+
+
+def _remove_file(file_path):
+    """Remove file_path if it exists, with a single syscall."""
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+def _link_or_copy(src, dst):
+    """Hard link src to dst, copy when they're on different filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+_ENV_VAR_RE = re.compile(r"\$(\w+)")
+
+
+def _split_switches(switches):
+    """Split a string of docker switches into argv, expanding $VAR like the shell did."""
+    return shlex.split(_ENV_VAR_RE.sub(lambda m: os.environ.get(m.group(1), ""), switches))
+
+
+# image -> name of the container started for this process, None if it couldn't be started
+_session_containers = {}
+_session_lock = threading.Lock()
+
+
+def _session_container(docker_image, run_switches):
+    """Return the name of a long running container of docker_image to docker exec into.
+
+    The container is started on first use with run_switches (mounts, display...) and
+    removed when the process exits. Returns None when it can't be started so callers
+    fall back to a docker run per command.
+    """
+    with _session_lock:
+        if docker_image in _session_containers:
+            return _session_containers[docker_image]
+        name = f"caravel-cocotb-{os.getpid()}-{len(_session_containers)}"
+        try:
+            returncode = subprocess.run(
+                ["docker", "run", "-d", "--rm", "--init", "--name", name]
+                + _split_switches(run_switches())
+                + [docker_image, "tail", "-f", "/dev/null"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            ).returncode
+        except OSError:  # docker isn't installed
+            returncode = 127
+        if returncode != 0:
+            _session_containers[docker_image] = None
+            return None
+        atexit.register(
+            subprocess.run,
+            ["docker", "rm", "-f", name],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        _session_containers[docker_image] = name
+        return name
+
+
+# Output lines filtered out from the console (they are always logged to file)
+_NOISE_PATTERN_STRINGS = (
+    r'^-v\s+/',  # Docker volume mounts
+    r'docker\.io/',  # Docker image refs
+    r"What's next:",
+    r'docker scout',
+    r'View a summary of image',
+    r'platform.*does not match',
+    r'^\s*$',  # Empty lines
+    r'DeprecationWarning',  # Python deprecation warnings
+    r'RuntimeWarning',  # Runtime warnings
+    r'^\*+$',  # Lines of just asterisks
+    r'^\*\*\s',  # Cocotb table lines starting with **
+    r'^\s+\*\*',  # Cocotb table continuation lines
+    r'cocotb\.scheduler\.add',  # Scheduler deprecation
+    r'/usr/local/lib/python.*\.py:\d+:',  # Python path warnings with line numbers
+    r'^\s+cocotb\.(scheduler|log)',  # Cocotb internal refs
+    r'===WARNING===.*sky130',  # SKY130 timing warnings
+    r'^VCD info:',  # VCD file info
+    r'^\s+self\.',  # Stack trace lines starting with self.
+    r'^/opt/homebrew/',  # Homebrew path warnings
+    r'gpi_embed\.cpp',  # GPI embed messages
+    r'GpiCommon\.cpp',  # GPI common messages
+    r'in gpi_print_registered',  # GPI registration
+    r'in set_program_name_in_venv',  # venv detection
+    r'VPI registered',  # VPI registration
+    r'pytest not found',  # Pytest suggestion
+)
+_NOISE_RE = re.compile("|".join(f"(?:{p})" for p in _NOISE_PATTERN_STRINGS))
+_ANSI_ESCAPE = re.compile(r"\x1B[@-_][0-?]*[ -/]*[@-~]")
+
+
+def _build_noise_matcher():
+    """Return a callable telling whether a console line matches any noise pattern.
+
+    Uses a hyperscan database when hyperscan is installed so all patterns are
+    matched in a single pass, otherwise the combined ``_NOISE_RE`` alternation.
+    """
+    if hyperscan is not None:
+        count = len(_NOISE_PATTERN_STRINGS)
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[p.encode() for p in _NOISE_PATTERN_STRINGS],
+                ids=list(range(count)),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_ALLOWEMPTY] * count,
+            )
+        except hyperscan.error:
+            db = None
+        if db is not None:
+            scan_terminated = hyperscan.ScanTerminated
+
+            def on_match(id, start, end, flags, context):
+                context.append(id)
+                return True  # stop scanning at the first hit
+
+            def is_noise(line):
+                # empty matches aren't reported on empty data so blank lines are handled here
+                if not line or line.isspace():
+                    return True
+                hits = []
+                try:
+                    db.scan(line.encode("utf-8"), match_event_handler=on_match, context=hits)
+                except scan_terminated:  # raised when on_match stops the scan
+                    return True
+                return bool(hits)
+
+            return is_noise
+
+    def is_noise(line):
+        return _NOISE_RE.search(line) is not None
+
+    return is_noise
+
+
+_is_noise = _build_noise_matcher()
 
 
 class RunTest:
     COMPILE_LOCK = set()
+    # one lock per compilation directory / hex file so tests running in parallel
+    # (-jobs) compile each shared target once and don't overwrite each other's hex
+    _compile_locks = {}
+    _hex_locks = {}
 
     def __init__(self, args, paths, test, logger) -> None:
         self.args = args
@@ -35,8 +518,32 @@ class RunTest:
         addtional_switchs="",
         command="",
     ):
-        command = f"docker run {' --init -it --sig-proxy=true ' if not self.args.CI else ' '} -u $(id -u $USER):$(id -g $USER) {addtional_switchs} {env_vars} {docker_dir} {docker_image} sh -ec '{command}'"
-        return command
+        """Return the argv running command with sh inside docker_image."""
+        interactive = [] if self.args.CI else ["-it"]
+        user = ["-u", f"{os.getuid()}:{os.getgid()}"]
+        container = _session_container(docker_image, self.session_docker_switches)
+        if container is not None:
+            return (
+                ["docker", "exec"] + interactive + user + _split_switches(env_vars)
+                + [container, "sh", "-ec", command]
+            )
+        if not self.args.CI:
+            interactive = ["--init", "-it", "--sig-proxy=true"]
+        return (
+            ["docker", "run"] + interactive + user
+            + _split_switches(f"{addtional_switchs} {env_vars} {docker_dir}")
+            + [docker_image, "sh", "-ec", command]
+        )
+
+    def session_docker_switches(self):
+        """switches of the session container, the union of what every docker command needs"""
+        # the simulator mounts plus what hex generation needs on top of them
+        # (hex_files and the test directories are under SIM_PATH)
+        mounts = self.iverilog_docker_mounts() + [_volume(self.paths.SIM_PATH, hint="delegated")]
+        if "MCW_ROOT" in self.paths._fields:
+            mounts.append(_volume(self.paths.MCW_ROOT))
+        mounts += [_volume(link) for link in self.get_ips_fw()]
+        return f"{_DISPLAY_SWITCHES} {_mount_switches(mounts)}"
 
     def hex_riscv_command_gen(self):
         GCC_PATH = "/opt/riscv/bin/"
@@ -49,24 +556,16 @@ class RunTest:
         LINKER_SCRIPT = f"-Wl,-Bstatic,-T,{self.test.linker_script_file},--strip-debug "
         CPUFLAGS = "-O2 -g -march=rv32i_zicsr -mabi=ilp32 -D__vexriscv__ -ffreestanding -nostdlib"
         # CPUFLAGS = "-O2 -g -march=rv32imc_zicsr -mabi=ilp32 -D__vexriscv__ -ffreestanding -nostdlib"
-        includes = [f"-I{ip}" for ip in self.get_ips_fw()] + [
-            f"-I{self.paths.FIRMWARE_PATH}",
-            f"-I{self.paths.FIRMWARE_PATH}/APIs",
-            f"-I{self.paths.USER_PROJECT_ROOT}/verilog/dv/cocotb",
-            f"-I{self.paths.VERILOG_PATH}/dv/generated",
-            f"-I{self.paths.VERILOG_PATH}/dv/",
-            f"-I{self.paths.VERILOG_PATH}/common/",
-        ]
+        ips_fw_includes = " ".join([f"-I{ip}" for ip in self.get_ips_fw()])
         includes = f" -I{self.paths.FIRMWARE_PATH} -I{self.paths.FIRMWARE_PATH}/APIs -I{self.paths.VERILOG_PATH}/dv/generated  -I{self.paths.VERILOG_PATH}/dv/ -I{self.paths.VERILOG_PATH}/common"
-        includes += f" -I{self.paths.USER_PROJECT_ROOT}/verilog/dv/cocotb {' '.join([f'-I{ip}' for ip in self.get_ips_fw()])}"
+        includes += f" -I{self.paths.USER_PROJECT_ROOT}/verilog/dv/cocotb {ips_fw_includes}"
         elf_command = (
             f"{GCC_COMPILE}-gcc  {includes} {CPUFLAGS} {LINKER_SCRIPT}"
             f" -o {self.hex_dir}/{self.test.name}.elf {SOURCE_FILES} {self.c_file}"
         )
         lst_command = f"{GCC_COMPILE}-objdump -d -S {self.hex_dir}/{self.test.name}.elf > {self.hex_dir}/{self.test.name}.lst "
         hex_command = f"{GCC_COMPILE}-objcopy -O verilog {self.hex_dir}/{self.test.name}.elf {self.hex_dir}/{self.test.name}.hex "
-        sed_command = f'sed -ie "s/@10/@00/g" {self.hex_dir}/{self.test.name}.hex'
-        return f" {elf_command} && {lst_command} && {hex_command} && {sed_command}"
+        return _hex_command_chain(elf_command, lst_command, hex_command)
 
     def hex_arm_command_gen(self):
         GCC_COMPILE = "arm-none-eabi"
@@ -80,15 +579,13 @@ class RunTest:
         )
         lst_command = f"{GCC_COMPILE}-objdump -d -S {self.hex_dir}/{self.test.name}.elf > {self.hex_dir}/{self.test.name}.lst "
         hex_command = f"{GCC_COMPILE}-objcopy -O verilog {self.hex_dir}/{self.test.name}.elf {self.hex_dir}/{self.test.name}.hex "
-        sed_command = f'sed -ie "s/@10/@00/g" {self.hex_dir}/{self.test.name}.hex'
-        return f" {elf_command} &&{lst_command}&& {hex_command}&& {sed_command}"
+        return _hex_command_chain(elf_command, lst_command, hex_command)
 
     def hex_generate(self) -> str:
         # get the test path from dv/cocotb
         test_path = self.test_path()
         # Create a new hex_files directory because it does not exist
-        if not os.path.exists(f"{self.paths.SIM_PATH}/hex_files"):
-            os.makedirs(f"{self.paths.SIM_PATH}/hex_files")
+        _ensure_dir(f"{self.paths.SIM_PATH}/hex_files")
         self.hex_dir = f"{self.paths.SIM_PATH}/hex_files/"
         self.c_file = f"{test_path}/{self.test.name}.c"
         if self.args.cpu_type == "ARM":
@@ -96,25 +593,40 @@ class RunTest:
         else:
             command = self.hex_riscv_command_gen()
 
-        docker_dir = f"-v {self.hex_dir}:{self.hex_dir} -v {self.paths.RUN_PATH}:{self.paths.RUN_PATH} -v {self.paths.CARAVEL_ROOT}:{self.paths.CARAVEL_ROOT} "
+        mounts = [
+            _volume(self.hex_dir, hint="delegated"),
+            _volume(self.paths.RUN_PATH),
+            _volume(self.paths.CARAVEL_ROOT),
+        ]
         if "MCW_ROOT" in self.paths._fields:
-            docker_dir += f"-v {self.paths.MCW_ROOT}:{self.paths.MCW_ROOT} "
-        docker_dir += f"-v {self.test.test_dir}:{self.test.test_dir} {' '.join([f'-v {link}:{link} ' for link in self.get_ips_fw()])} "
-        docker_dir = (
-            docker_dir
-            + f"-v {self.paths.USER_PROJECT_ROOT}:{self.paths.USER_PROJECT_ROOT}"
-        )
+            mounts.append(_volume(self.paths.MCW_ROOT))
+        mounts.append(_volume(self.test.test_dir, hint="delegated"))
+        mounts += [_volume(link) for link in self.get_ips_fw()]
+        mounts.append(_volume(self.paths.USER_PROJECT_ROOT))
+        docker_dir = _mount_switches(mounts)
         docker_command = self.docker_command_str(
             docker_image="chipfoundry/dv:cocotb", docker_dir=docker_dir, command=command
         )
         # don't run with docker with arm
         cmd = command if self.args.cpu_type == "ARM" else docker_command
-        hex_gen_state = self.run_command_write_to_file(
-            cmd,
-            self.test.hex_log,
-            self.logger,
-            quiet=False if self.args.verbosity == "debug" else True,
-        )
+        with RunTest._hex_locks.setdefault(self.test.name, threading.Lock()):
+            # the hex is hard linked into tests ran before, start from a new file
+            # instead of rewriting theirs
+            _remove_file(f"{self.test.hex_dir}/{self.test.name}.hex")
+            hex_gen_state = self.run_command_write_to_file(
+                cmd,
+                self.test.hex_log,
+                self.logger,
+                quiet=False if self.args.verbosity == "debug" else True,
+            )
+            if hex_gen_state == 0:
+                _remap_hex_addresses(f"{self.test.hex_dir}/{self.test.name}.hex")
+                # move hex file to the test
+                _remove_file(f"{self.test.test_dir}/firmware.hex")
+                _link_or_copy(
+                    f"{self.test.hex_dir}/{self.test.name}.hex",
+                    f"{self.test.test_dir}/firmware.hex",
+                )
         self.firmware_log = open(self.test.hex_log, "a")
         if hex_gen_state != 0:
             # open(self.test.firmware_log, "w").write(stdout)
@@ -126,29 +638,10 @@ class RunTest:
             return "hex_error"
         self.firmware_log.write("Pass: hex generation")
         self.firmware_log.close()
-        # move hex file to the test
-        shutil.copyfile(
-            f"{self.test.hex_dir}/{self.test.name}.hex",
-            f"{self.test.test_dir}/firmware.hex",
-        )
         return "hex_generated"
 
     def get_ips_fw(self, flag_type="-I"):
-        fw_list = []
-        if not os.path.exists(f"{self.paths.USER_PROJECT_ROOT}/ip"):
-            return fw_list
-        for file in os.listdir(f"{self.paths.USER_PROJECT_ROOT}/ip"):
-            if os.path.isdir(f"{self.paths.USER_PROJECT_ROOT}/ip/{file}"):
-                for f in os.listdir(f"{self.paths.USER_PROJECT_ROOT}/ip/{file}"):
-                    if f == "fw":
-                        fw_list.append(
-                            os.path.realpath(
-                                f"{self.paths.USER_PROJECT_ROOT}/ip/{file}/{f}"
-                            )
-                        )
-        # send it as string
-        # ips_fw = f"{flag_type}" + f" {flag_type}".join(fw_list)
-        return fw_list
+        return list(_scan_ip_fw(self.paths.USER_PROJECT_ROOT))
 
     def test_path(self, test_name=None):
         if test_name is None:
@@ -157,8 +650,9 @@ class RunTest:
         tests_path_user = os.path.abspath(
             f"{self.paths.USER_PROJECT_ROOT}/verilog/dv/cocotb"
         )
-        test_file = self.find(c_file_name, tests_path_user)
-        test_path = os.path.dirname(test_file)
+        test_path = _build_test_index(tests_path_user).get(c_file_name)
+        if test_path is None:
+            raise RuntimeError(f"Test {c_file_name} doesn't exist or don't have a C file ")
         return test_path
 
     def runTest(self):
@@ -177,42 +671,115 @@ class RunTest:
                 f"{bcolors.FAIL}iverilog can't run SDF for test {self.test.name} Please use anothor simulator like cvc{bcolors.ENDC}"
             )
             return
-        self.write_iverilog_includes_file()
-        if not os.path.isfile(f"{self.test.compilation_dir}/sim.vvp"):
-            print(f"{bcolors.OKCYAN}Compiling as sim.vvp not found{bcolors.ENDC}")
-            self.iverilog_compile()
-            self.write_hash(self.test.netlist)
-        elif self.args.compile:
-            print(f"{bcolors.OKCYAN}Compiling as compile flag is set{bcolors.ENDC}")
-            self.iverilog_compile()
-            self.write_hash(self.test.netlist)
-        elif (
-            not self.is_same_hash(self.test.netlist)
-            and f"{self.test.compilation_dir}/sim.vvp" not in RunTest.COMPILE_LOCK
-        ):
-            print(f"{bcolors.OKCYAN}Compiling since netlist has changed{bcolors.ENDC}")
-            self.iverilog_compile()
-        else:
-            if f"{self.test.compilation_dir}/sim.vvp" not in RunTest.COMPILE_LOCK:
-                print(
-                    f"{bcolors.OKGREEN}Skipping compilation as netlist has not changed{bcolors.ENDC}"
-                )
-        RunTest.COMPILE_LOCK.add(
-            f"{self.test.compilation_dir}/sim.vvp"
-        )  # locked means if it is copiled for the first time then it will not be compiled again even if netlist changes
+        compile_lock = RunTest._compile_locks.setdefault(
+            f"{self.test.compilation_dir}/sim.vvp", threading.Lock()
+        )
+        with compile_lock:
+            # includes.v lives in the shared compilation directory, write it under the lock
+            self.write_iverilog_includes_file()
+            if not os.path.isfile(f"{self.test.compilation_dir}/sim.vvp"):
+                print(f"{bcolors.OKCYAN}Compiling as sim.vvp not found{bcolors.ENDC}")
+                self.iverilog_compile()
+                self.write_hash(self.test.netlist)
+            elif (
+                self.args.compile
+                and f"{self.test.compilation_dir}/sim.vvp" not in RunTest.COMPILE_LOCK
+            ):
+                print(f"{bcolors.OKCYAN}Compiling as compile flag is set{bcolors.ENDC}")
+                self.iverilog_compile()
+                self.write_hash(self.test.netlist)
+            elif (
+                not self.is_same_hash(self.test.netlist)
+                and f"{self.test.compilation_dir}/sim.vvp" not in RunTest.COMPILE_LOCK
+            ):
+                print(f"{bcolors.OKCYAN}Compiling since netlist has changed{bcolors.ENDC}")
+                self.iverilog_compile()
+            else:
+                if f"{self.test.compilation_dir}/sim.vvp" not in RunTest.COMPILE_LOCK:
+                    print(
+                        f"{bcolors.OKGREEN}Skipping compilation as netlist has not changed{bcolors.ENDC}"
+                    )
+            RunTest.COMPILE_LOCK.add(
+                f"{self.test.compilation_dir}/sim.vvp"
+            )  # locked means if it is copiled for the first time then it will not be compiled again even if netlist changes
         if not self.args.compile_only:
             self.iverilog_run()
 
     def write_iverilog_includes_file(self):
-        self.iverilog_dirs = " "
-        self.iverilog_dirs += f"-I {self.paths.USER_PROJECT_ROOT}/verilog/rtl"
         self.test.set_user_project()
-        for include_dir in self.test.include_dirs:
-            self.iverilog_dirs += f" -I {include_dir}"
+        self.iverilog_include_dirs = [f"{self.paths.USER_PROJECT_ROOT}/verilog/rtl"] + sorted(
+            self.test.include_dirs
+        )
+        self.iverilog_dirs = " " + " ".join(
+            [f"-I {self.paths.USER_PROJECT_ROOT}/verilog/rtl"]
+            + [f"-I {include_dir}" for include_dir in self.test.include_dirs]
+        )
 
     def iverilog_compile(self):
-        if os.path.isfile(f"{self.test.compilation_dir}/sim.vvp"):
-            os.remove(f"{self.test.compilation_dir}/sim.vvp")
+        _remove_file(f"{self.test.compilation_dir}/sim.vvp")
+        cache_key = self.compile_cache_key()
+        if cache_key is None:
+            self._iverilog_compile()
+            return
+        with contextlib.ExitStack() as stack:
+            try:
+                cache_dir = stack.enter_context(_locked_dir(f"{_COMPILE_CACHE_DIR}/{cache_key}"))
+            except OSError as e:  # read-only or missing home, no flock on NFS...
+                print(f"{bcolors.WARNING}Compilation cache unavailable ({e}), compiling{bcolors.ENDC}")
+                self._iverilog_compile()
+                return
+            if os.path.isfile(f"{cache_dir}/sim.vvp") and not self.args.compile:
+                print(f"{bcolors.OKGREEN}Reusing identical compilation {cache_dir}/sim.vvp{bcolors.ENDC}")
+                try:
+                    _link_or_copy(f"{cache_dir}/sim.vvp", f"{self.test.compilation_dir}/sim.vvp")
+                    os.utime(cache_dir)  # mark as recently used for pruning
+                    return
+                except OSError:
+                    _remove_file(f"{self.test.compilation_dir}/sim.vvp")
+            self._iverilog_compile()
+            if os.path.isfile(f"{self.test.compilation_dir}/sim.vvp"):
+                try:
+                    _remove_file(f"{cache_dir}/sim.vvp")
+                    _link_or_copy(f"{self.test.compilation_dir}/sim.vvp", f"{cache_dir}/sim.vvp")
+                except OSError:  # entry pruned by another run meanwhile, the compilation is still usable
+                    pass
+        _prune_compile_cache(_COMPILE_CACHE_DIR, _COMPILE_CACHE_MAX_ENTRIES)
+
+    def compile_cache_key(self):
+        """hash of everything the iverilog compilation depends on, None if it can't be computed"""
+        toolchain = _toolchain_id("chipfoundry/dv:cocotb", self.args.no_docker)
+        if toolchain is None:
+            return None
+        toplevel_file = f"{self.paths.CARAVEL_VERILOG_PATH}/rtl/toplevel_cocotb.v"
+        try:
+            with open(self.test.includes_file, "rb") as f:
+                includes = f.read()
+        except OSError:
+            return None
+        # the netlist, the toplevel and whatever they `include (headers, primitive models)
+        sources = _include_closure(
+            [self.test.includes_file, toplevel_file, *sorted(self.test.netlist)],
+            [self.test.compilation_dir, *self.iverilog_include_dirs],
+        )
+        existing = [file_path for file_path in sources if os.path.isfile(file_path)]
+        sources_hash = self.calculate_netlist_hash(existing)
+        if sources_hash.startswith(("File not found", "Permission denied")):
+            return None
+        key = (
+            tuple(self.test.macros),
+            self.iverilog_dirs,
+            includes,
+            toplevel_file,
+            tuple(sorted(sources)),
+            sources_hash,
+            toolchain,
+            self.args.no_docker,
+        )
+        import hashlib
+
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    def _iverilog_compile(self):
         macros = " -D" + " -D".join(self.test.macros)
         # Top-level module is always caravel_top - the OPENFRAME macro controls which design is instantiated
         top_module = "caravel_top"
@@ -231,9 +798,11 @@ class RunTest:
         )
 
     def iverilog_run(self):
+        from caravel_cocotb.scripts.verify_cocotb.read_defines import GetDefines
+
         defines = GetDefines(self.test.includes_file)
         seed = "" if self.args.seed is None else f"RANDOM_SEED={self.args.seed}"
-        run_command = f"cd {self.test.test_dir} && TESTCASE={self.test.name} MODULE=module_trail {seed} vvp -M $(cocotb-config --prefix)/cocotb/libs -m libcocotbvpi_icarus {self.test.compilation_dir}/sim.vvp +{' +'.join(self.test.macros)} {' '.join([f'+{k}={v}' if v != '' else f'+{k}' for k, v in defines.defines.items()])}"
+        run_command = f"cd {self.test.test_dir} && COCOTB_RESULTS_FILE={self.test.test_dir}/seed.xml TESTCASE={self.test.name} MODULE=module_trail {seed} vvp -M $(cocotb-config --prefix)/cocotb/libs -m libcocotbvpi_icarus {self.test.compilation_dir}/sim.vvp {self.test.macros_plusargs} {defines.rendered_plusargs}"
         docker_run_command = self._iverilog_docker_command_str(run_command)
         self.run_command_write_to_file(
             docker_run_command if not self.args.no_docker else run_command,
@@ -246,95 +815,104 @@ class RunTest:
         """the docker command without the command that would run"""
         # Build environment variables - handle OpenFrame (no VERILOG_PATH from MCW)
         if self.args.openframe:
-            env_vars = f"-e COCOTB_RESULTS_FILE={os.getenv('COCOTB_RESULTS_FILE')} -e CARAVEL_PATH={self.paths.CARAVEL_PATH} -e CARAVEL_VERILOG_PATH={self.paths.CARAVEL_VERILOG_PATH} -e PDK_ROOT={self.paths.PDK_ROOT} -e PDK={self.paths.PDK} -e USER_PROJECT_VERILOG={self.paths.USER_PROJECT_ROOT}/verilog -e OPENFRAME=1"
+            env_vars = f"-e COCOTB_RESULTS_FILE={self.test.test_dir}/seed.xml -e CARAVEL_PATH={self.paths.CARAVEL_PATH} -e CARAVEL_VERILOG_PATH={self.paths.CARAVEL_VERILOG_PATH} -e PDK_ROOT={self.paths.PDK_ROOT} -e PDK={self.paths.PDK} -e USER_PROJECT_VERILOG={self.paths.USER_PROJECT_ROOT}/verilog -e OPENFRAME=1"
         else:
-            env_vars = f"-e COCOTB_RESULTS_FILE={os.getenv('COCOTB_RESULTS_FILE')} -e CARAVEL_PATH={self.paths.CARAVEL_PATH} -e CARAVEL_VERILOG_PATH={self.paths.CARAVEL_VERILOG_PATH} -e VERILOG_PATH={self.paths.VERILOG_PATH} -e PDK_ROOT={self.paths.PDK_ROOT} -e PDK={self.paths.PDK} -e USER_PROJECT_VERILOG={self.paths.USER_PROJECT_ROOT}/verilog"
-        local_caravel_cocotb_path = caravel_cocotb.__file__.replace("__init__.py", "")
-        docker_caravel_cocotb_path = (
-            "/usr/local/lib/python3.10/dist-packages/caravel_cocotb/"
-        )
-        # Build volume mounts - skip MCW_ROOT for OpenFrame
-        docker_dir = f"-v {self.paths.RUN_PATH}:{self.paths.RUN_PATH} -v {self.paths.CARAVEL_ROOT}:{self.paths.CARAVEL_ROOT} "
-        if not self.args.openframe and "MCW_ROOT" in self.paths._fields:
-            docker_dir += f"-v {self.paths.MCW_ROOT}:{self.paths.MCW_ROOT} "
-        docker_dir += f"-v {self.paths.PDK_ROOT}:{self.paths.PDK_ROOT} -v {local_caravel_cocotb_path}:{docker_caravel_cocotb_path} "
-        docker_dir += (
-            f"-v {self.paths.USER_PROJECT_ROOT}:{self.paths.USER_PROJECT_ROOT}"
-        )
-        docker_dir += " ".join(
-            [
-                f" -v {link}:{link} "
-                for link in self.find_symbolic_links(self.paths.USER_PROJECT_ROOT)
-            ]
-        )
-        if os.path.exists("/mnt/scratch/"):
-            docker_dir += " -v /mnt/scratch/cocotb_runs/:/mnt/scratch/cocotb_runs/ "
-        display = " -e DISPLAY=$DISPLAY -v /tmp/.X11-unix:/tmp/.X11-unix -v $HOME/.Xauthority:/.Xauthority --network host --security-opt seccomp=unconfined "
+            env_vars = f"-e COCOTB_RESULTS_FILE={self.test.test_dir}/seed.xml -e CARAVEL_PATH={self.paths.CARAVEL_PATH} -e CARAVEL_VERILOG_PATH={self.paths.CARAVEL_VERILOG_PATH} -e VERILOG_PATH={self.paths.VERILOG_PATH} -e PDK_ROOT={self.paths.PDK_ROOT} -e PDK={self.paths.PDK} -e USER_PROJECT_VERILOG={self.paths.USER_PROJECT_ROOT}/verilog"
         command = self.docker_command_str(
             docker_image="chipfoundry/dv:cocotb",
-            docker_dir=docker_dir,
+            docker_dir=_mount_switches(self.iverilog_docker_mounts()),
             env_vars=env_vars,
-            addtional_switchs=display,
+            addtional_switchs=_DISPLAY_SWITCHES,
             command=command,
         )
         return command
 
+    def iverilog_docker_mounts(self):
+        """volumes the simulator containers need"""
+        import caravel_cocotb
+
+        local_caravel_cocotb_path = caravel_cocotb.__file__.replace("__init__.py", "")
+        docker_caravel_cocotb_path = (
+            "/usr/local/lib/python3.10/dist-packages/caravel_cocotb/"
+        )
+        # Build volume mounts - skip MCW_ROOT for OpenFrame
+        # RUN_PATH holds the sim directory by default, the simulator writes there
+        mounts = [
+            _volume(self.paths.RUN_PATH, hint="delegated"),
+            _volume(self.paths.CARAVEL_ROOT),
+        ]
+        if not self.args.openframe and "MCW_ROOT" in self.paths._fields:
+            mounts.append(_volume(self.paths.MCW_ROOT))
+        mounts += [
+            _volume(self.paths.PDK_ROOT),
+            _volume(local_caravel_cocotb_path, docker_caravel_cocotb_path),
+            _volume(self.paths.USER_PROJECT_ROOT),
+        ]
+        mounts += [
+            _volume(link)
+            for link in self.find_symbolic_links(self.paths.USER_PROJECT_ROOT)
+        ]
+        if _scratch_exists():
+            mounts.append(_volume("/mnt/scratch/cocotb_runs/", hint="delegated"))
+        return mounts
+
     def find_symbolic_links(self, directory):
-        sym_links = []
-        for root, dirs, files in os.walk(directory):
-            for dir_name in dirs:
-                dir_path = os.path.join(root, dir_name)
-                if os.path.islink(dir_path):
-                    sym_links.append(dir_path)
-        return sym_links
+        return list(_find_symbolic_links(directory))
 
     # vcs function
     def runTest_vcs(self):
-        self.write_vcs_includes_file()
         self.vcs_coverage_command = ""
         if self.test.sim == "RTL":
             self.vcs_coverage_command = "-cm line+tgl+cond+fsm+branch+assert "
         os.environ["TESTCASE"] = f"{self.test.name}"
         os.environ["MODULE"] = "module_trail"
-        if not os.path.isfile(f"{self.test.compilation_dir}/simv"):
-            print(f"{bcolors.OKCYAN}Compiling as simv not found{bcolors.ENDC}")
-            self.vcs_compile()
-            self.write_hash(self.test.netlist)
-        elif self.args.compile:
-            print(f"{bcolors.OKCYAN}Compiling as compile flag is set{bcolors.ENDC}")
-            self.vcs_compile()
-            self.write_hash(self.test.netlist)
-        elif (
-            not self.is_same_hash(self.test.netlist)
-            and f"{self.test.compilation_dir}/simv" not in RunTest.COMPILE_LOCK
-        ):
-            print(
-                f"{bcolors.OKCYAN}Compiling since netlist has has changed{bcolors.ENDC}"
-            )
-            self.vcs_compile()
-        else:
-            if f"{self.test.compilation_dir}/simv" not in RunTest.COMPILE_LOCK:
+        compile_lock = RunTest._compile_locks.setdefault(
+            f"{self.test.compilation_dir}/simv", threading.Lock()
+        )
+        with compile_lock:
+            # includes.v lives in the shared compilation directory, write it under the lock
+            self.write_vcs_includes_file()
+            if not os.path.isfile(f"{self.test.compilation_dir}/simv"):
+                print(f"{bcolors.OKCYAN}Compiling as simv not found{bcolors.ENDC}")
+                self.vcs_compile()
+                self.write_hash(self.test.netlist)
+            elif (
+                self.args.compile
+                and f"{self.test.compilation_dir}/simv" not in RunTest.COMPILE_LOCK
+            ):
+                print(f"{bcolors.OKCYAN}Compiling as compile flag is set{bcolors.ENDC}")
+                self.vcs_compile()
+                self.write_hash(self.test.netlist)
+            elif (
+                not self.is_same_hash(self.test.netlist)
+                and f"{self.test.compilation_dir}/simv" not in RunTest.COMPILE_LOCK
+            ):
                 print(
-                    f"{bcolors.OKCYAN}Skipping compilation as netlist has not changed{bcolors.ENDC}"
+                    f"{bcolors.OKCYAN}Compiling since netlist has has changed{bcolors.ENDC}"
                 )
-        RunTest.COMPILE_LOCK.add(
-            f"{self.test.compilation_dir}/simv"
-        )  # locked means if it is copiled for the first time then it will not be compiled again even if netlist changes
+                self.vcs_compile()
+            else:
+                if f"{self.test.compilation_dir}/simv" not in RunTest.COMPILE_LOCK:
+                    print(
+                        f"{bcolors.OKCYAN}Skipping compilation as netlist has not changed{bcolors.ENDC}"
+                    )
+            RunTest.COMPILE_LOCK.add(
+                f"{self.test.compilation_dir}/simv"
+            )  # locked means if it is copiled for the first time then it will not be compiled again even if netlist changes
         if not self.args.compile_only:
             self.vcs_run()
 
     def write_vcs_includes_file(self):
         # self.vcs_dirs = f'+incdir+\\"{self.paths.PDK_ROOT}/{self.paths.PDK}\\" '
-        self.vcs_dirs = " "
-        if self.test.sim == "RTL":
-            self.vcs_dirs += (
-                f'+incdir+\\"{self.paths.USER_PROJECT_ROOT}/verilog/rtl\\" '
-            )
+        self.vcs_dirs = (
+            f' +incdir+\\"{self.paths.USER_PROJECT_ROOT}/verilog/rtl\\" '
+            if self.test.sim == "RTL"
+            else " "
+        )
         self.test.set_user_project()
 
     def vcs_compile(self):
-        if os.path.isfile(f"{self.test.compilation_dir}/simv"):
-            os.remove(f"{self.test.compilation_dir}/simv")
+        _remove_file(f"{self.test.compilation_dir}/simv")
         macros = " +define+" + " +define+".join(self.test.macros)
         # Top-level module is always caravel_top - the OPENFRAME macro controls which design is instantiated
         top_module = "caravel_top"
@@ -357,10 +935,12 @@ class RunTest:
         )
 
     def vcs_run(self):
+        from caravel_cocotb.scripts.verify_cocotb.read_defines import GetDefines
+
         defines = GetDefines(self.test.includes_file)
         if self.args.seed is not None:
             os.environ["RANDOM_SEED"] = self.args.seed
-        run_sim = f"cd {self.test.test_dir}; {self.test.compilation_dir}/simv +vcs+dumpvars+all {self.vcs_coverage_command} -cm_name {self.test.name} +{' +'.join(self.test.macros)} {' '.join([f'+{k}={v}' if v != '' else f'+{k}' for k, v in defines.defines.items()])}"
+        run_sim = f"cd {self.test.test_dir}; {self.test.compilation_dir}/simv +vcs+dumpvars+all {self.vcs_coverage_command} -cm_name {self.test.name} {self.test.macros_plusargs} {defines.rendered_plusargs}"
         self.run_command_write_to_file(
             run_sim,
             None if self.args.verbosity == "quiet" else self.test.test_log2,
@@ -368,55 +948,22 @@ class RunTest:
             quiet=True if self.args.verbosity == "quiet" else False,
         )
 
-    def find(self, name, path):
-        for root, dirs, files in os.walk(path):
-            if name in files:
-                return os.path.join(root, name)
-        raise RuntimeError(f"Test {name} doesn't exist or don't have a C file ")
-
     def run_command_write_to_file(self, cmd, file, logger, quiet=True):
         """Run command and write output to file, return 0 if no error.
+
+        cmd is either a shell command string or an argv list run without a shell.
         
         Improvements:
         - Filters out noisy output (docker volumes, platform warnings)
         - Deduplicates progressive line output (truncated + full)
         - Only shows important messages in normal mode
         """
-        # Patterns to filter out from console (always log to file)
-        noise_patterns = [
-            re.compile(r'^-v\s+/'),  # Docker volume mounts
-            re.compile(r'docker\.io/'),  # Docker image refs
-            re.compile(r"What's next:"),
-            re.compile(r'docker scout'),
-            re.compile(r'View a summary of image'),
-            re.compile(r'platform.*does not match'),
-            re.compile(r'^\s*$'),  # Empty lines
-            re.compile(r'DeprecationWarning'),  # Python deprecation warnings
-            re.compile(r'RuntimeWarning'),  # Runtime warnings
-            re.compile(r'^\*+$'),  # Lines of just asterisks
-            re.compile(r'^\*\*\s'),  # Cocotb table lines starting with **
-            re.compile(r'^\s+\*\*'),  # Cocotb table continuation lines
-            re.compile(r'cocotb\.scheduler\.add'),  # Scheduler deprecation
-            re.compile(r'/usr/local/lib/python.*\.py:\d+:'),  # Python path warnings with line numbers
-            re.compile(r'^\s+cocotb\.(scheduler|log)'),  # Cocotb internal refs
-            re.compile(r'===WARNING===.*sky130'),  # SKY130 timing warnings
-            re.compile(r'^VCD info:'),  # VCD file info
-            re.compile(r'^\s+self\.'),  # Stack trace lines starting with self.
-            re.compile(r'^/opt/homebrew/'),  # Homebrew path warnings
-            re.compile(r'gpi_embed\.cpp'),  # GPI embed messages
-            re.compile(r'GpiCommon\.cpp'),  # GPI common messages
-            re.compile(r'in gpi_print_registered'),  # GPI registration
-            re.compile(r'in set_program_name_in_venv'),  # venv detection
-            re.compile(r'VPI registered'),  # VPI registration
-            re.compile(r'pytest not found'),  # Pytest suggestion
-        ]
-        
         # Set up file logging separately
         log_file = None
         if file is not None:
             log_file = open(file, "a")
             log_file.write("command:\n")
-            log_file.write(os.path.expandvars(cmd) + "\n\n")
+            log_file.write((shlex.join(cmd) if isinstance(cmd, list) else os.path.expandvars(cmd)) + "\n\n")
             log_file.write("-" * 60 + "\n")
         
         # Buffered deduplication: hold each line and only print when we see a different line
@@ -428,14 +975,16 @@ class RunTest:
             """Check if line1 is a truncated version of line2 (strict prefix)."""
             if not line1 or not line2:
                 return False
+            # They must differ by at least a few characters (not just whitespace),
+            # checked first as it rules out most consecutive lines without a compare
+            length_diff = len(line1) - len(line2)
+            if -3 < length_diff < 3:
+                return False
             # One must be a strict prefix of the other (progressive output)
             # This is NOT the same as sharing a common prefix
-            shorter, longer = (line1, line2) if len(line1) < len(line2) else (line2, line1)
+            shorter, longer = (line1, line2) if length_diff < 0 else (line2, line1)
             # The shorter line must be a prefix of the longer line
-            # And they must differ by at least a few characters (not just whitespace)
-            if longer.startswith(shorter) and len(longer) > len(shorter) + 2:
-                return True
-            return False
+            return longer[0] == shorter[0] and longer.startswith(shorter)
         
         def flush_buffer():
             """Print the buffered line if there is one."""
@@ -444,49 +993,63 @@ class RunTest:
                 print(buffered_line)
                 buffered_line = None
         
+        process = None
         try:
             process = subprocess.Popen(
                 cmd,
-                shell=True,
+                shell=not isinstance(cmd, list),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
             )
             
-            ansi_escape = re.compile(r"\x1B[@-_][0-?]*[ -/]*[@-~]")
-            
-            while True:
-                out = process.stdout.readline()
-                if not out and process.poll() is not None:
-                    break
-                if out:
+            def handle_lines(raw_lines):
+                nonlocal buffered_line
+                clean_lines = []
+                for out in raw_lines:
                     try:
                         line = out.decode("utf-8")
                     except UnicodeDecodeError:
                         line = out.decode("latin-1")
-                    
                     # Strip ANSI codes for clean output
-                    clean_line = ansi_escape.sub("", line).rstrip()
-                    
-                    # Always log to file (full output)
-                    if log_file is not None and clean_line:
-                        log_file.write(clean_line + "\n")
-                        log_file.flush()
-                    
-                    # Only show to console if not quiet and not noise
-                    if not quiet and clean_line:
-                        is_noise = any(p.search(clean_line) for p in noise_patterns)
-                        
-                        if not is_noise:
-                            if is_progressive_duplicate(clean_line, buffered_line):
-                                # Progressive duplicate - keep the longer one
-                                if len(clean_line) > len(buffered_line or ""):
-                                    buffered_line = clean_line
-                                # else: current is shorter, keep buffered (it's longer)
-                            else:
-                                # Different line - flush buffer and start new
-                                flush_buffer()
-                                buffered_line = clean_line
-            
+                    clean_line = _ANSI_ESCAPE.sub("", line).rstrip()
+                    if clean_line:
+                        clean_lines.append(clean_line)
+
+                # Always log to file (full output), one write per chunk
+                if log_file is not None and clean_lines:
+                    log_file.write("\n".join(clean_lines) + "\n")
+
+                # Only show to console if not quiet and not noise
+                if quiet:
+                    return
+                for clean_line in clean_lines:
+                    if _is_noise(clean_line):
+                        continue
+                    if is_progressive_duplicate(clean_line, buffered_line):
+                        # Progressive duplicate - keep the longer one
+                        if len(clean_line) > len(buffered_line or ""):
+                            buffered_line = clean_line
+                        # else: current is shorter, keep buffered (it's longer)
+                    else:
+                        # Different line - flush buffer and start new
+                        flush_buffer()
+                        buffered_line = clean_line
+
+            # read whatever is available in large blocks and split into lines here,
+            # the trailing partial line is carried over to the next block
+            fd = process.stdout.fileno()
+            pending = b""
+            while True:
+                chunk = os.read(fd, _READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                raw_lines = (pending + chunk).split(b"\n")
+                pending = raw_lines.pop()
+                handle_lines(raw_lines)
+            if pending:
+                handle_lines([pending])
+            process.wait()
+
             # Flush any remaining buffered line
             flush_buffer()
                             
@@ -503,24 +1066,26 @@ class RunTest:
             if log_file is not None:
                 log_file.close()
 
+        if process is None:  # couldn't be started, same status the shell gives
+            return 127
         return process.returncode
 
     @staticmethod
-    def calculate_netlist_hash(netlist, hash_algorithm="sha256"):
+    def calculate_netlist_hash(netlist, hash_algorithm="blake3"):
         """Calculate a combined hash of multiple files ignoring the order."""
-        hash_func = getattr(hashlib, hash_algorithm)()
-        try:
-            for file_path in sorted(netlist):  # Ensure consistent order
-                with open(file_path, "rb") as f:
-                    while chunk := f.read(8192):
-                        hash_func.update(chunk)
-            return hash_func.hexdigest()
-        except FileNotFoundError as e:
-            return f"File not found: {e.filename}"
-        except PermissionError as e:
-            return f"Permission denied: {e.filename}"
+        return _hash_netlist(_netlist_fingerprint(netlist), hash_algorithm)
 
     def is_same_hash(self, netlist):
+        # files untouched since the hash was written (same mtime and size) -> same hash
+        try:
+            with open(f"{self.test.hash_log}.stat", "r") as f:
+                old_fingerprint = f.read()
+            if old_fingerprint == repr(_netlist_fingerprint(netlist)) and os.path.isfile(
+                self.test.hash_log
+            ):
+                return True
+        except FileNotFoundError:
+            pass
         # read old hash if exists
         try:
             with open(self.test.hash_log, "r") as f:
@@ -532,9 +1097,12 @@ class RunTest:
         return new_hash == old_hash
 
     def write_hash(self, netlist):
+        fingerprint = _netlist_fingerprint(netlist)
         new_hash = self.calculate_netlist_hash(netlist)
         with open(self.test.hash_log, "w") as f:
             f.write(new_hash)
+        with open(f"{self.test.hash_log}.stat", "w") as f:
+            f.write(repr(fingerprint))
         return new_hash
 
 
@@ -6,6 +6,8 @@ import sys
 import glob
 from pathlib import Path
 import shutil
+import tempfile
+import threading
 import xml.etree.ElementTree as ET
 from caravel_cocotb.scripts.verify_cocotb.RunTest import change_str
 from caravel_cocotb.scripts.verify_cocotb.RunTest import bcolors
@@ -17,6 +19,7 @@ class Test:
     unknown_count = 0
     passed_count = 0
     failed_count = 0
+    _counters_lock = threading.Lock()
 
     def __init__(self, name, sim, corner, args, paths, logger, local_macros=None):
         self.name = name
@@ -76,6 +79,8 @@ class Test:
             self.macros.remove(
                 "COCOTB_SIM"
             )  # using debug register in this test isn't needed
+        # macros passed to the simulator at run time
+        self.macros_plusargs = "+" + " +".join(self.macros)
 
     def set_user_project(self):
         # Determine project type
@@ -126,15 +131,17 @@ class Test:
         self.endtime = datetime.now().strftime("%H:%M:%S(%a)")
         self.duration = "%.10s" % (datetime.now() - self.start_time_t)
         self.seed = self.get_seed()
-        Test.unknown_count -= 1
         is_pass = self.check_test_pass()
         self.passed = is_pass[0]
         Path(f"{self.test_dir}/{self.passed}").touch()
-        if is_pass[1]:
-            Test.passed_count += 1
-            # Note: Clean result is printed by test_run_function in RunRegression
-        else:
-            Test.failed_count += 1
+        # Note: Clean result is printed by test_run_function in RunRegression
+        with Test._counters_lock:
+            Test.unknown_count -= 1
+            if is_pass[1]:
+                Test.passed_count += 1
+            else:
+                Test.failed_count += 1
+        if not is_pass[1]:
             # Log error details to help user find the issue
             if not os.path.isfile(self.compilation_log):
                 pass
@@ -162,8 +169,7 @@ class Test:
         if os.path.isdir(self.test_dir):
             shutil.rmtree(self.test_dir)
         os.mkdir(self.test_dir)
-        if not os.path.exists(self.compilation_dir):
-            os.mkdir(self.compilation_dir)
+        os.makedirs(self.compilation_dir, exist_ok=True)
         self.test_log = f"{self.test_dir}/{self.name}.log"
         self.test_log2 = f"{self.test_dir}/test.log"
         self.firmware_log = f"{self.test_dir}/firmware_error.log"
@@ -339,8 +345,8 @@ class Test:
             includes = ""
             
         includes = paths + includes
-        open(self.includes_file, "w").write(includes)
-        move_defines_to_start(self.includes_file, 'defines.v"')
+        # tests sharing the compilation directory may be reading these files (-jobs)
+        write_file_atomic(self.includes_file, defines_to_start(includes))
         # copy includes used also
         paths = open(file, "r").read()
         self.includes_list = f"{self.compilation_dir}/includes"
@@ -365,8 +371,7 @@ class Test:
             includes = ""
             
         includes = paths + includes
-        open(self.includes_list, "w").write(includes)
-        move_defines_to_start(self.includes_list, "defines.v")
+        write_file_atomic(self.includes_list, defines_to_start(includes))
 
     def convert_list_to_include(self, file):
         paths = ""
@@ -431,16 +436,30 @@ def move_defines_to_start(filename, pattern):
     # Read the contents of the file into a list of lines
     # print(f"file name = {filename}")
     with open(filename, "r") as f:
-        lines = f.readlines()
+        text = f.read()
+
+    # Write the modified list of lines back to the file
+    write_file_atomic(filename, defines_to_start(text))
 
+
+def defines_to_start(text):
+    lines = text.splitlines(keepends=True)
     # Extract the lines that end with "defines.v"
     defines_lines = [line for line in lines if line.strip().endswith('defines.v"')]
-    # print(defines_lines)
     # Remove the extracted lines from the original list
     lines = [f"{line.strip()}\n" for line in lines if line not in defines_lines]
     # Insert the extracted lines at the start of the list
-    lines = defines_lines + lines
+    return "".join(defines_lines + lines)
 
-    # Write the modified list of lines back to the file
-    with open(filename, "w") as f:
-        f.writelines(lines)
+
+def write_file_atomic(filename, text):
+    # write next to the target and rename over it, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filename) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates the file as 0600
+        os.replace(tmp_path, filename)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
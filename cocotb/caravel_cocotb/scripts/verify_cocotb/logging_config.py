@@ -7,11 +7,17 @@ This module provides:
 - Clean test progress and summary formatting
 """
 
+import atexit
+import functools
 import logging
 import sys
 import re
+from operator import attrgetter
 from typing import Optional
 
+# Probed once; whether stdout is a terminal does not change mid-run
+_STDOUT_IS_TTY = sys.stdout.isatty()
+
 
 class Colors:
     """ANSI color codes for terminal output."""
@@ -34,8 +40,22 @@ class Colors:
     DEBUG = DIM
 
 
+def _sgr(*codes: str) -> str:
+    """Build one SGR escape carrying all ``codes`` (e.g. ``_sgr("92", "1")``)."""
+    return f"\033[{';'.join(codes)}m"
+
+
+def _union(patterns) -> "re.Pattern":
+    """Compile a list of regexes into a single alternation."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
 class CleanFormatter(logging.Formatter):
     """Custom formatter that applies colors based on log level and filters noise."""
+
+    # logging.Formatter keeps a __dict__ (which also holds the per-instance
+    # format binding), but the attributes read on every record live in slots
+    __slots__ = ("use_colors", "verbosity", "_fast")
     
     # Patterns to suppress in normal mode (these are noisy docker/simulator outputs)
     SUPPRESS_PATTERNS = [
@@ -54,82 +74,160 @@ class CleanFormatter(logging.Formatter):
         r'^\d+\.\d+ns\s+INFO\s+cocotb\.regression',  # Test summary
     ]
     
+    _suppress_re = _union(SUPPRESS_PATTERNS)
+    _important_re = _union(IMPORTANT_PATTERNS)
+    
+    # Every non-blank SUPPRESS_PATTERNS entry is anchored, so a line can only
+    # match if it starts with one of these; blank lines are caught separately
+    # in should_suppress().
+    _suppress_prefixes = ("-v", "docker.io/", "WARNING:")
+    # Literal substrings at least one of which appears in any line
+    # IMPORTANT_PATTERNS can match; lines without them skip the regex entirely.
+    _important_hints = ("[TEST]", "PASS", "FAIL", "Error:", "Warning:", "Critical:", "Test:", "cocotb.regression")
+    
+    # Patterns to always suppress on the console (never useful to end users)
+    NOISE_PATTERNS = [
+        r'^-v\s+/',  # Docker volume mounts building up
+        r'^docker\.io/',
+        r'What\'s next:',
+        r'View a summary of image vulnerabilities',
+        r'docker scout',
+    ]
+    
+    _noise_re = _union(NOISE_PATTERNS)
+    # Substrings covering every pattern above, checked before the regex
+    _noise_hints = ("-v", "docker", "What's next:", "View a summary")
+
+    # Result keywords recoloured in important lines
+    _pass_re = re.compile(r"PASS|passed")
+    _pass_repl = f"{Colors.GREEN}\\g<0>{Colors.ENDC}"
+    _fail_re = re.compile(r"FAIL|failed")
+    _fail_repl = f"{Colors.FAIL}\\g<0>{Colors.ENDC}"
+
     LEVEL_COLORS = {
         logging.DEBUG: Colors.DIM,
         logging.INFO: "",
         logging.WARNING: Colors.WARNING,
         logging.ERROR: Colors.FAIL,
-        logging.CRITICAL: Colors.FAIL + Colors.BOLD,
+        logging.CRITICAL: _sgr("91", "1"),
     }
-    
+    # (prefix, suffix) wrapping for every levelno up to CRITICAL, None when uncoloured.
+    # Custom levels take the colour of the standard level below them, anything
+    # above CRITICAL falls back to _wrap_above_critical.
+    _wrap_by_level = {
+        levelno: (color, Colors.ENDC) if color else None
+        for levelno, color in enumerate(
+            map(LEVEL_COLORS.get, [n // 10 * 10 for n in range(logging.CRITICAL)], [""] * logging.CRITICAL)
+        )
+    }
+    _wrap_above_critical = (LEVEL_COLORS[logging.CRITICAL], Colors.ENDC)
+
     def __init__(self, fmt=None, datefmt=None, use_colors=True, verbosity="normal"):
         super().__init__(fmt, datefmt)
-        self.use_colors = use_colors and sys.stdout.isatty()
+        self.use_colors = use_colors and _STDOUT_IS_TTY
         self.verbosity = verbosity
-        self._suppress_re = [re.compile(p) for p in self.SUPPRESS_PATTERNS]
-        self._important_re = [re.compile(p) for p in self.IMPORTANT_PATTERNS]
+        # A bare "%(message)s" format needs none of the base class machinery
+        self._fast = fmt == "%(message)s"
+        # Choose the colour or plain path once rather than branching per record
+        self.format = self._format_color if self.use_colors else self._format_plain
     
     def format(self, record):
-        msg = super().format(record)
-        
-        # Apply level-based colors
+        # Shadowed per instance in __init__; kept for calls made through the class
         if self.use_colors:
-            color = self.LEVEL_COLORS.get(record.levelno, "")
-            if color:
-                msg = f"{color}{msg}{Colors.ENDC}"
-            
-            # Highlight important patterns
-            if any(p.search(msg) for p in self._important_re):
-                if "PASS" in msg or "passed" in msg.lower():
-                    msg = msg.replace("PASS", f"{Colors.GREEN}PASS{Colors.ENDC}")
-                    msg = msg.replace("passed", f"{Colors.GREEN}passed{Colors.ENDC}")
-                elif "FAIL" in msg or "failed" in msg.lower():
-                    msg = msg.replace("FAIL", f"{Colors.FAIL}FAIL{Colors.ENDC}")
-                    msg = msg.replace("failed", f"{Colors.FAIL}failed{Colors.ENDC}")
-        
+            return self._format_color(record)
+        return self._format_plain(record)
+
+    def _format_plain(self, record):
+        if self._fast and record.exc_info is None and record.stack_info is None:
+            record.message = record.getMessage()
+            return record.message
+        return super().format(record)
+
+    def formatMessage(self, record):
+        # "%(message)s" is just the message; skip the PercentStyle substitution
+        # on records (exceptions, stack info) that take the full format() path
+        if self._fast:
+            return record.message
+        return super().formatMessage(record)
+
+    def _format_color(self, record):
+        msg = self._format_plain(record)
+
+        # Apply level-based colors
+        wrap = self._wrap_by_level.get(record.levelno, self._wrap_above_critical)
+        if wrap is not None:
+            msg = wrap[0] + msg + wrap[1]
+
+        # Highlight important patterns
+        if any(h in msg for h in self._important_hints) and self._important_re.search(msg) is not None:
+            msg, count = self._pass_re.subn(self._pass_repl, msg)
+            if not count:
+                msg = self._fail_re.sub(self._fail_repl, msg)
+
         return msg
-    
+
+    def is_noise(self, record) -> bool:
+        """Check if a record matches NOISE_PATTERNS (never useful to end users)."""
+        # Only pay for %-formatting when the record actually has arguments
+        msg = record.getMessage() if record.args else str(record.msg)
+        if not any(h in msg for h in self._noise_hints):
+            return False
+        return self._noise_re.search(msg) is not None
+
     def should_suppress(self, message: str) -> bool:
         """Check if a message should be suppressed based on verbosity."""
         if self.verbosity == "debug":
             return False
-        
-        # Always suppress docker volume mount spam
-        if any(p.search(message) for p in self._suppress_re):
+
+        if not message.strip():
             return True
         
-        return False
+        # Always suppress docker volume mount spam
+        if not message.startswith(self._suppress_prefixes):
+            return False
+        return self._suppress_re.search(message) is not None
 
 
-class OutputFilter(logging.Filter):
-    """Filter that suppresses noisy output in normal/quiet modes."""
-    
-    # Patterns to always suppress (never useful to end users)
-    NOISE_PATTERNS = [
-        r'^-v\s+/',  # Docker volume mounts building up
-        r'^docker\.io/',
-        r'What\'s next:',
-        r'View a summary of image vulnerabilities',
-        r'docker scout',
-    ]
-    
-    def __init__(self, verbosity="normal"):
-        super().__init__()
-        self.verbosity = verbosity
-        self._noise_re = [re.compile(p) for p in self.NOISE_PATTERNS]
-    
-    def filter(self, record):
-        if self.verbosity == "debug":
-            return True
-        
-        msg = record.getMessage()
-        
-        # Check if it's noise
-        for pattern in self._noise_re:
-            if pattern.search(msg):
-                return False
-        
-        return True
+class _BufferedFileHandler(logging.FileHandler):
+    """File handler that buffers writes and only flushes on warnings and above."""
+
+    BUFFER_SIZE = 1 << 16
+
+    def __init__(self, filename, mode="w"):
+        # open (and truncate) right away so a run never leaves the previous log behind
+        super().__init__(filename, mode)
+        atexit.register(self.flush)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.BUFFER_SIZE, encoding=self.encoding)
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            # warnings and above right away, the rest when the buffer fills or at exit
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+@functools.lru_cache(maxsize=4)
+def _console_formatter(verbosity: str) -> CleanFormatter:
+    """Console formatter shared by every logger set up with ``verbosity``."""
+    return CleanFormatter(
+        fmt="%(message)s",
+        use_colors=True,
+        verbosity=verbosity
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _console_filter(verbosity: str):
+    """Noise filter paired with ``_console_formatter(verbosity)``."""
+    formatter = _console_formatter(verbosity)
+    return lambda record: not formatter.is_noise(record)
 
 
 def setup_logger(name: str, verbosity: str = "normal", log_file: Optional[str] = None) -> logging.Logger:
@@ -159,17 +257,14 @@ def setup_logger(name: str, verbosity: str = "normal", log_file: Optional[str] =
     
     # Console handler with colors
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(CleanFormatter(
-        fmt="%(message)s",
-        use_colors=True,
-        verbosity=verbosity
-    ))
-    console_handler.addFilter(OutputFilter(verbosity))
+    console_handler.setFormatter(_console_formatter(verbosity))
+    if verbosity != "debug":
+        console_handler.addFilter(_console_filter(verbosity))
     logger.addHandler(console_handler)
     
     # File handler (no colors, full output)
     if log_file:
-        file_handler = logging.FileHandler(log_file, mode='w')
+        file_handler = _BufferedFileHandler(log_file, mode='w')
         file_handler.setFormatter(logging.Formatter("%(message)s"))
         file_handler.setLevel(logging.DEBUG)  # Always log everything to file
         logger.addHandler(file_handler)
@@ -177,67 +272,83 @@ def setup_logger(name: str, verbosity: str = "normal", log_file: Optional[str] =
     return logger
 
 
+_SEPARATOR = "=" * 60
+_DIVIDER = "-" * 62
+_CYAN_SEP = f"{Colors.CYAN}{_SEPARATOR}{Colors.ENDC}"
+_TABLE_HEADER = f"{Colors.DIM}{'Test':<40} {'Status':<10} {'Duration':<12}{Colors.ENDC}"
+
+# Output templates with the escape codes already filled in
+_HEADER_TMPL = (
+    f"\n{_CYAN_SEP}\n"
+    f"{Colors.BOLD}Running: {Colors.ENDC}{{name}}\n"
+    f"{Colors.DIM}Simulation: {{sim}}{Colors.ENDC}\n"
+    f"{_CYAN_SEP}\n\n"
+)
+_PASSED_TMPL = f"\n✓ Test: {{}} {_sgr('92', '1')}PASSED{Colors.ENDC}\n"
+_FAILED_TMPL = f"\n✗ Test: {{}} {_sgr('91', '1')}FAILED{Colors.ENDC}\n"
+
+
 def print_test_header(test_name: str, sim_type: str = "RTL"):
     """Print a clean header for test execution."""
-    separator = "=" * 60
-    print(f"\n{Colors.CYAN}{separator}{Colors.ENDC}")
-    print(f"{Colors.BOLD}Running: {Colors.ENDC}{test_name}")
-    print(f"{Colors.DIM}Simulation: {sim_type}{Colors.ENDC}")
-    print(f"{Colors.CYAN}{separator}{Colors.ENDC}\n")
+    sys.stdout.write(_HEADER_TMPL.format(name=test_name, sim=sim_type))
 
 
 def print_test_result(test_name: str, passed: bool, duration: str = "", errors: int = 0, warnings: int = 0):
     """Print a clean test result summary."""
-    if passed:
-        status = f"{Colors.GREEN}{Colors.BOLD}PASSED{Colors.ENDC}"
-        icon = "✓"
-    else:
-        status = f"{Colors.FAIL}{Colors.BOLD}FAILED{Colors.ENDC}"
-        icon = "✗"
-    
-    print(f"\n{icon} Test: {test_name} {status}")
+    out = [(_PASSED_TMPL if passed else _FAILED_TMPL).format(test_name)]
     if duration:
-        print(f"  Duration: {duration}")
+        out.append(f"  Duration: {duration}\n")
     if errors > 0 or warnings > 0:
-        print(f"  Errors: {errors}, Warnings: {warnings}")
-    print()
+        out.append(f"  Errors: {errors}, Warnings: {warnings}\n")
+    out.append("\n")
+    sys.stdout.write("".join(out))
+
+
+_summary_fields = attrgetter("passed", "full_name", "duration")
+_PASSED_STATUS = f"{Colors.GREEN}passed{Colors.ENDC}"
+_FAILED_STATUS = f"{Colors.FAIL}failed{Colors.ENDC}"
+_UNKNOWN_STATUS = f"{Colors.WARNING}unknown{Colors.ENDC}"
 
 
 def print_summary_table(tests: list, total_duration: str):
     """Print a clean summary table of all test results."""
-    passed = sum(1 for t in tests if t.passed == "passed")
-    failed = sum(1 for t in tests if t.passed == "failed")
+    # Count results and format the per-test rows in a single pass
+    passed = failed = 0
+    rows = []
+    for result, name, duration in map(_summary_fields, tests):
+        if result == "passed":
+            passed += 1
+            status = _PASSED_STATUS
+        elif result == "failed":
+            failed += 1
+            status = _FAILED_STATUS
+        else:
+            status = _UNKNOWN_STATUS
+        rows.append(f"{name:<40} {status:<20} {duration:<12}\n")
     unknown = len(tests) - passed - failed
     
-    separator = "=" * 60
-    
-    print(f"\n{Colors.CYAN}{separator}{Colors.ENDC}")
-    print(f"{Colors.BOLD}Test Summary{Colors.ENDC}")
-    print(f"{Colors.CYAN}{separator}{Colors.ENDC}")
+    # Build the whole table and hand it to stdout in one write
+    out = [
+        f"\n{_CYAN_SEP}\n",
+        f"{Colors.BOLD}Test Summary{Colors.ENDC}\n",
+        f"{_CYAN_SEP}\n",
+    ]
     
     # Summary counts
-    print(f"\n  Total:   {len(tests)}")
-    print(f"  {Colors.GREEN}Passed:  {passed}{Colors.ENDC}")
+    out.append(f"\n  Total:   {len(tests)}\n")
+    out.append(f"  {Colors.GREEN}Passed:  {passed}{Colors.ENDC}\n")
     if failed > 0:
-        print(f"  {Colors.FAIL}Failed:  {failed}{Colors.ENDC}")
+        out.append(f"  {Colors.FAIL}Failed:  {failed}{Colors.ENDC}\n")
     else:
-        print(f"  Failed:  {failed}")
+        out.append(f"  Failed:  {failed}\n")
     if unknown > 0:
-        print(f"  {Colors.WARNING}Unknown: {unknown}{Colors.ENDC}")
-    print(f"  Duration: {total_duration}")
+        out.append(f"  {Colors.WARNING}Unknown: {unknown}{Colors.ENDC}\n")
+    out.append(f"  Duration: {total_duration}\n")
     
     # Individual test results
-    print(f"\n{Colors.DIM}{'Test':<40} {'Status':<10} {'Duration':<12}{Colors.ENDC}")
-    print("-" * 62)
-    
-    for test in tests:
-        if test.passed == "passed":
-            status = f"{Colors.GREEN}passed{Colors.ENDC}"
-        elif test.passed == "failed":
-            status = f"{Colors.FAIL}failed{Colors.ENDC}"
-        else:
-            status = f"{Colors.WARNING}unknown{Colors.ENDC}"
-        
-        print(f"{test.full_name:<40} {status:<20} {test.duration:<12}")
+    out.append(f"\n{_TABLE_HEADER}\n")
+    out.append(f"{_DIVIDER}\n")
+    out.extend(rows)
     
-    print(f"{Colors.CYAN}{separator}{Colors.ENDC}")
+    out.append(f"{_CYAN_SEP}\n")
+    sys.stdout.write("".join(out))
@@ -1,7 +1,12 @@
+import functools
+import os
 import re
 
 
 class GetDefines:
+    # (define file path, mtime) -> parsed defines, define files are shared by every test
+    _define_files = {}
+
     def __init__(self, file):
         self.__call__(file)
 
@@ -10,9 +15,24 @@ class GetDefines:
         define_paths = self.get_include_paths_verilog(file)
         self.defines = {}
         for path in define_paths:
-            self.defines.update(self.read_define_file(path))
+            self.defines.update(self.read_define_file_cached(path))
+        self.__dict__.pop("rendered_plusargs", None)
         return self.defines
 
+    @functools.cached_property
+    def rendered_plusargs(self):
+        """the defines as simulator plusargs +name=value (+name for empty values)"""
+        return " ".join(
+            f"+{k}={v}" if v != "" else f"+{k}" for k, v in self.defines.items()
+        )
+
+    def read_define_file_cached(self, file_path):
+        key = (file_path, os.stat(file_path).st_mtime_ns)
+        defines = GetDefines._define_files.get(key)
+        if defines is None:
+            defines = GetDefines._define_files[key] = self.read_define_file(file_path)
+        return defines
+
     def verilog_num_parser(self, number):
         number = str(number)
         number = number.replace("\t", " ").replace(" ", "")
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+
+import caravel_cocotb.scripts.verify_cocotb.RunTest as run_test
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return str(path)
+
+
+def test_include_closure_follows_nested_includes(tmp_path):
+    inc = tmp_path / "inc"
+    top = write(tmp_path / "top.v", '`include "a.vh"\n`include "missing.vh"\n')
+    a = write(inc / "a.vh", '`include "b.vh"\n')
+    b = write(tmp_path / "b.vh", "`define B 1\n")
+    found = run_test._include_closure([top], [str(inc), str(tmp_path)])
+    assert found[0] == top
+    assert set(found) == {top, a, b, "missing.vh"}
+
+
+def test_include_closure_tries_the_including_directory(tmp_path):
+    top = write(tmp_path / "rtl" / "top.v", '`include "local.vh"\n')
+    local = write(tmp_path / "rtl" / "local.vh", "")
+    assert run_test._include_closure([top], []) == [top, local]
+
+
+def test_include_closure_folds_in_directories_of_macro_includes(tmp_path):
+    inc = tmp_path / "inc"
+    top = write(tmp_path / "top.v", "`include `MODELS\n")
+    models = write(inc / "models.v", "")
+    found = run_test._include_closure([top], [str(inc)])
+    assert models in found
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_test, "_toolchain_id", lambda docker_image, no_docker: "iverilog 12")
+    run_test._hash_netlist.cache_clear()
+    compilation_dir = tmp_path / "compilation"
+    netlist = write(tmp_path / "rtl" / "user.v", '`include "defs.vh"\nmodule user; endmodule\n')
+    write(tmp_path / "rtl" / "defs.vh", "`define WIDTH 8\n")
+    write(tmp_path / "caravel" / "rtl" / "toplevel_cocotb.v", "module caravel_top; endmodule\n")
+    runner = object.__new__(run_test.RunTest)
+    runner.args = SimpleNamespace(no_docker=False)
+    runner.paths = SimpleNamespace(CARAVEL_VERILOG_PATH=str(tmp_path / "caravel"))
+    runner.test = SimpleNamespace(
+        includes_file=write(compilation_dir / "includes.v", f'`include "{netlist}"\n'),
+        netlist=[netlist],
+        compilation_dir=str(compilation_dir),
+        macros=["FUNCTIONAL", "SIM"],
+    )
+    runner.iverilog_include_dirs = [str(tmp_path / "rtl")]
+    runner.iverilog_dirs = f"-I {tmp_path / 'rtl'}"
+    yield runner
+    run_test._hash_netlist.cache_clear()
+
+
+def test_compile_cache_key_is_stable(runner):
+    assert runner.compile_cache_key() == runner.compile_cache_key()
+
+
+def test_compile_cache_key_follows_included_sources(runner, tmp_path):
+    before = runner.compile_cache_key()
+    write(tmp_path / "rtl" / "defs.vh", "`define WIDTH 16\n")
+    assert runner.compile_cache_key() != before
+
+
+def test_compile_cache_key_follows_macros(runner):
+    before = runner.compile_cache_key()
+    runner.test.macros = ["FUNCTIONAL", "SIM", "GL"]
+    assert runner.compile_cache_key() != before
+
+
+def test_compile_cache_key_follows_toolchain(runner, monkeypatch):
+    before = runner.compile_cache_key()
+    monkeypatch.setattr(run_test, "_toolchain_id", lambda docker_image, no_docker: "iverilog 13")
+    assert runner.compile_cache_key() != before
+
+
+def test_compile_cache_key_needs_a_toolchain(runner, monkeypatch):
+    monkeypatch.setattr(run_test, "_toolchain_id", lambda docker_image, no_docker: None)
+    assert runner.compile_cache_key() is None
+
+
+def test_unusable_cache_falls_back_to_compiling(runner, tmp_path, monkeypatch):
+    monkeypatch.setattr(run_test, "_COMPILE_CACHE_DIR", write(tmp_path / "not_a_dir", ""))
+    compiled = []
+    runner.args.compile = False
+    runner._iverilog_compile = lambda: compiled.append(True)
+    runner.iverilog_compile()
+    assert compiled == [True]
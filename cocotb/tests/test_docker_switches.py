@@ -0,0 +1,53 @@
+import os
+
+import caravel_cocotb.scripts.verify_cocotb.RunTest as run_test
+
+
+def test_nested_mounts_are_skipped(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_test, "_MOUNT_HINTS", False)
+    root = os.path.realpath(tmp_path)
+    nested = os.path.join(root, "caravel", "verilog")
+    mounts = [(root, root, "cached"), (nested, nested, "cached")]
+    assert run_test._mount_switches(mounts) == f"-v {root}:{root}"
+
+
+def test_nested_mounts_with_another_hint_are_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_test, "_MOUNT_HINTS", True)
+    root = os.path.realpath(tmp_path)
+    nested = os.path.join(root, "sim")
+    mounts = [(root, root, "cached"), (nested, nested, "delegated")]
+    assert run_test._mount_switches(mounts) == f"-v {root}:{root}:cached -v {nested}:{nested}:delegated"
+
+
+def test_mounts_through_symbolic_links_are_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_test, "_MOUNT_HINTS", False)
+    root = os.path.realpath(tmp_path)
+    os.mkdir(os.path.join(root, "target"))
+    link = os.path.join(root, "link")
+    os.symlink(os.path.join(root, "target"), link)
+    mounts = [(root, root, "cached"), (link, link, "cached")]
+    assert run_test._mount_switches(mounts) == f"-v {root}:{root} -v {link}:{link}"
+
+
+def test_repeated_destinations_are_dropped(monkeypatch):
+    monkeypatch.setattr(run_test, "_MOUNT_HINTS", False)
+    mounts = [("/a", "/data", "cached"), ("/b", "/data", "cached")]
+    assert run_test._mount_switches(mounts) == "-v /a:/data"
+
+
+def test_split_switches_expands_environment_variables(monkeypatch):
+    monkeypatch.setenv("HOME", "/home/user")
+    monkeypatch.delenv("CARAVEL_COCOTB_UNSET", raising=False)
+    switches = " -e DISPLAY=:0 -v $HOME/.Xauthority:/.Xauthority -e X=$CARAVEL_COCOTB_UNSET "
+    assert run_test._split_switches(switches) == [
+        "-e",
+        "DISPLAY=:0",
+        "-v",
+        "/home/user/.Xauthority:/.Xauthority",
+        "-e",
+        "X=",
+    ]
+
+
+def test_split_switches_keeps_quoted_arguments():
+    assert run_test._split_switches("-e 'MSG=a b' --network host") == ["-e", "MSG=a b", "--network", "host"]
@@ -0,0 +1,19 @@
+import os
+
+import caravel_cocotb.scripts.verify_cocotb.RunTest as run_test
+
+
+def test_address_markers_are_remapped(tmp_path):
+    hex_file = tmp_path / "test.hex"
+    hex_file.write_bytes(b"@10000000\n6F 00 00 0B\n@10000010\n13 05 00 00\n")
+    run_test._remap_hex_addresses(str(hex_file))
+    assert hex_file.read_bytes() == b"@00000000\n6F 00 00 0B\n@00000010\n13 05 00 00\n"
+
+
+def test_file_without_markers_is_left_untouched(tmp_path):
+    hex_file = tmp_path / "test.hex"
+    hex_file.write_bytes(b"@00000000\n6F 00 00 0B\n")
+    os.utime(hex_file, ns=(0, 0))
+    run_test._remap_hex_addresses(str(hex_file))
+    assert hex_file.read_bytes() == b"@00000000\n6F 00 00 0B\n"
+    assert os.stat(hex_file).st_mtime_ns == 0
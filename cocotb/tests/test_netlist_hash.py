@@ -0,0 +1,51 @@
+import hashlib
+
+import pytest
+
+import caravel_cocotb.scripts.verify_cocotb.RunTest as run_test
+
+
+@pytest.fixture(autouse=True)
+def clear_hash_cache():
+    run_test._hash_netlist.cache_clear()
+    yield
+    run_test._hash_netlist.cache_clear()
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_hash_ignores_order(tmp_path):
+    a = write(tmp_path / "a.v", b"module a; endmodule\n")
+    b = write(tmp_path / "b.v", b"module b; endmodule\n")
+    assert run_test.RunTest.calculate_netlist_hash([a, b]) == run_test.RunTest.calculate_netlist_hash([b, a])
+
+
+def test_hash_follows_content(tmp_path):
+    a = write(tmp_path / "a.v", b"module a; endmodule\n")
+    before = run_test.RunTest.calculate_netlist_hash([a])
+    write(tmp_path / "a.v", b"module a(input x); endmodule\n")
+    assert run_test.RunTest.calculate_netlist_hash([a]) != before
+
+
+def test_hash_falls_back_to_sha256(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_test, "blake3", None)
+    data = b"module a; endmodule\n"
+    a = write(tmp_path / "a.v", data)
+    expected = hashlib.sha256(hashlib.sha256(data).digest()).hexdigest()
+    assert run_test.RunTest.calculate_netlist_hash([a]) == expected
+
+
+def test_mmap_and_read_hash_alike(tmp_path, monkeypatch):
+    a = write(tmp_path / "a.v", b"wire w;\n" * 1000)
+    read_hash = run_test.RunTest.calculate_netlist_hash([a])
+    run_test._hash_netlist.cache_clear()
+    monkeypatch.setattr(run_test, "_HASH_MMAP_THRESHOLD", 16)
+    assert run_test.RunTest.calculate_netlist_hash([a]) == read_hash
+
+
+def test_missing_file_is_reported(tmp_path):
+    missing = str(tmp_path / "missing.v")
+    assert run_test.RunTest.calculate_netlist_hash([missing]) == f"File not found: {missing}"
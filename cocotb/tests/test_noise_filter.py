@@ -0,0 +1,56 @@
+import re
+
+import pytest
+
+import caravel_cocotb.scripts.verify_cocotb.RunTest as run_test
+
+LINES = [
+    "",
+    "   ",
+    "-v /home/user/caravel:/home/user/caravel",
+    "docker.io/chipfoundry/dv:cocotb",
+    "What's next:",
+    "WARNING: The requested image's platform (linux/amd64) does not match",
+    "*****",
+    "** TEST                          STATUS  SIM TIME (ns)",
+    "    ** tests.test_io10              PASS",
+    "VCD info: dumpfile waves.vcd opened for output.",
+    "     -.--ns INFO     gpi                                ..mbed/gpi_embed.cpp:76   in set_program_name_in_venv",
+    "  self.log.info('x')",
+    "/usr/local/lib/python3.10/dist-packages/cocotb/handle.py:42: DeprecationWarning",
+    "1000.00ns INFO     cocotb.regression    test_io10 passed",
+    "[TEST] gpio 10 toggled",
+    "Error: mismatch at address 0x10",
+    "-verbose flag",
+]
+
+
+def test_noise_union_matches_each_pattern():
+    patterns = [re.compile(p) for p in run_test._NOISE_PATTERN_STRINGS]
+    for line in LINES:
+        expected = any(p.search(line) for p in patterns)
+        assert (run_test._NOISE_RE.search(line) is not None) == expected, line
+
+
+def test_ansi_escapes_are_stripped():
+    line = "\x1b[92mPASS\x1b[0m \x1b[1;31mFAIL\x1b[0m\x1b[K"
+    assert run_test._ANSI_ESCAPE.sub("", line) == "PASS FAIL"
+
+
+def regex_matcher(monkeypatch):
+    monkeypatch.setattr(run_test, "hyperscan", None)
+    return run_test._build_noise_matcher()
+
+
+def test_regex_matcher_matches_patterns(monkeypatch):
+    is_noise = regex_matcher(monkeypatch)
+    for line in LINES:
+        assert is_noise(line) == (run_test._NOISE_RE.search(line) is not None), line
+
+
+@pytest.mark.skipif(run_test.hyperscan is None, reason="hyperscan isn't installed")
+def test_hyperscan_matcher_agrees_with_regex(monkeypatch):
+    is_noise_hs = run_test._build_noise_matcher()
+    is_noise_re = regex_matcher(monkeypatch)
+    for line in LINES:
+        assert is_noise_hs(line) == is_noise_re(line), line
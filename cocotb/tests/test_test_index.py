@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+import caravel_cocotb.scripts.verify_cocotb.RunTest as run_test
+
+
+@pytest.fixture(autouse=True)
+def clear_index_cache():
+    run_test._build_test_index.cache_clear()
+    yield
+    run_test._build_test_index.cache_clear()
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "w").close()
+
+
+def test_index_maps_c_files_to_their_directory(tmp_path):
+    root = str(tmp_path)
+    touch(f"{root}/gpio/test_io10.c")
+    touch(f"{root}/gpio/test_io10.py")
+    touch(f"{root}/spi/deep/test_spi.c")
+    assert run_test._build_test_index(root) == {
+        "test_io10.c": f"{root}/gpio",
+        "test_spi.c": f"{root}/spi/deep",
+    }
+
+
+def test_shallower_file_wins(tmp_path):
+    root = str(tmp_path)
+    touch(f"{root}/a/test.c")
+    touch(f"{root}/test.c")
+    assert run_test._build_test_index(root)["test.c"] == root
+
+
+def test_directory_links_are_not_followed(tmp_path):
+    root = str(tmp_path / "tests")
+    touch(f"{tmp_path}/elsewhere/linked.c")
+    os.makedirs(root)
+    os.symlink(f"{tmp_path}/elsewhere", f"{root}/link")
+    assert run_test._build_test_index(root) == {}
+
+
+def test_missing_root_gives_an_empty_index(tmp_path):
+    assert run_test._build_test_index(str(tmp_path / "missing")) == {}